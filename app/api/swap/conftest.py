@@ -0,0 +1,120 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.common.models import Coin
+from app.api.swap import utils as swap_utils
+from app.api.swap.models import (
+    NetworkFee,
+    SwapProviderEnum,
+    SwapQuoteRequest,
+    SwapRoute,
+    SwapRouteStep,
+    SwapStepToken,
+    SwapTool,
+    SwapType,
+)
+from app.main import app
+
+_DEFAULT_ROUTE = SwapRoute(
+    id="test-route-1",
+    provider=SwapProviderEnum.NEAR_INTENTS,
+    steps=[
+        SwapRouteStep(
+            source_token=SwapStepToken(
+                coin=Coin.SOL,
+                chain_id="0x65",
+                contract_address="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                symbol="USDC",
+                decimals=6,
+                logo=None,
+            ),
+            source_amount="1000000",
+            destination_token=SwapStepToken(
+                coin=Coin.BTC,
+                chain_id="bitcoin_mainnet",
+                contract_address=None,
+                symbol="BTC",
+                decimals=8,
+                logo=None,
+            ),
+            destination_amount="3500",
+            tool=SwapTool(name="NEAR Intents", logo=None),
+        )
+    ],
+    source_amount="1000000",
+    destination_amount="3500",
+    destination_amount_min="3450",
+    requires_token_allowance=False,
+    requires_firm_route=True,
+    slippage_percentage="0.5",
+)
+
+_DEFAULT_REQUEST = SwapQuoteRequest(
+    source_coin=Coin.SOL,
+    source_chain_id="0x65",
+    source_token_address="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+    destination_coin=Coin.BTC,
+    destination_chain_id="bitcoin_mainnet",
+    destination_token_address=None,
+    recipient="bc1qpjqsdj3qvfl4hzfa49p28ns9xkpl73cyg9exzn",
+    amount="1000000",
+    slippage_percentage="0.5",
+    swap_type=SwapType.EXACT_INPUT,
+    refund_to="8eekKfUAGSJbq3CdA2TmHb8tKuyzd5gtEas3MYAtXzrT",
+    provider=SwapProviderEnum.AUTO,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_indicative_routes_cache():
+    swap_utils._indicative_routes_cache.clear()
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Not entered as a context manager: the app lifespan needs Redis, which
+    # route tests mock out.
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def make_route():
+    """Factory for mock SwapRoutes.
+
+    Copies a validated default route instead of re-validating the nested models,
+    so each call returns an independent object.
+    """
+
+    def factory(
+        route_id: str = "test-route-1",
+        source_amount: str = "1000000",
+        destination_amount: str = "3500",
+        estimated_time: int | None = None,
+        network_fee: NetworkFee | None = None,
+        gasless: bool = False,
+    ) -> SwapRoute:
+        step = _DEFAULT_ROUTE.steps[0].model_copy(
+            update={
+                "source_amount": source_amount,
+                "destination_amount": destination_amount,
+            }
+        )
+        return _DEFAULT_ROUTE.model_copy(
+            update={
+                "id": route_id,
+                "steps": [step],
+                "source_amount": source_amount,
+                "destination_amount": destination_amount,
+                "estimated_time": estimated_time,
+                "network_fee": network_fee,
+                "gasless": gasless,
+            }
+        )
+
+    return factory
+
+
+@pytest.fixture
+def quote_request() -> SwapQuoteRequest:
+    """A mock SwapQuoteRequest (AUTO provider); tests may mutate it freely."""
+    return _DEFAULT_REQUEST.model_copy()
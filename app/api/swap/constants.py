@@ -1,3 +1,19 @@
 # Default slippage percentage for providers that do not support automatic
 # slippage computation
 DEFAULT_SLIPPAGE_PERCENTAGE = "0.5"
+
+# Maximum number of concurrent support probes against a single provider host,
+# so that AUTO fan-outs cannot trip upstream rate limits
+MAX_SUPPORT_PROBES_PER_HOST = 16
+
+# How long an AUTO quote waits for a provider fan-out slot (see
+# settings.PROVIDER_FANOUT_LIMIT) before failing that provider, in seconds
+PROVIDER_FANOUT_WAIT_SECONDS = 10.0
+
+# For FASTEST route priority, how long to keep waiting on other providers once
+# one has returned routes, before cancelling them
+FASTEST_ROUTES_GRACE_SECONDS = 0.5
+
+# How long AUTO indicative routes are reused for identical quote requests (e.g.
+# quote refreshes), in seconds. Kept short so quotes stay fresh.
+INDICATIVE_ROUTES_CACHE_TTL_SECONDS = 3
@@ -4,9 +4,16 @@ This module defines custom metrics for tracking swap API performance,
 provider behavior, and usage patterns.
 """
 
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
 from prometheus_client import Counter, Histogram
 
 from .models import (
+    SwapError,
+    SwapErrorKind,
     SwapProviderEnum,
     SwapQuoteRequest,
     SwapStatus,
@@ -169,6 +176,49 @@ def record_provider_error(
     ).inc()
 
 
+@contextmanager
+def observe_quote(
+    request: SwapQuoteRequest,
+    quote_type: str,
+    provider: str | None = None,
+) -> Iterator[None]:
+    """Record the outcome of the quote request executed inside the block.
+
+    On exit, records the quote duration and request count. If the block raises,
+    also records a provider error (the SwapError kind, or UNKNOWN for any other
+    exception) under the "<quote_type>_quote" operation, then re-raises.
+    Cancellation (e.g. a FASTEST straggler being dropped) is not a quote outcome,
+    so nothing is recorded when the block is cancelled.
+
+    Args:
+        request: The swap quote request
+        quote_type: Type of quote (indicative, firm)
+        provider: Provider name override. If None, extracted from request
+                  (defaults to AUTO if request.provider is None)
+    """
+    start_time = time.perf_counter()
+    success = False
+    cancelled = False
+    try:
+        yield
+        success = True
+    except asyncio.CancelledError:
+        cancelled = True
+        raise
+    except Exception as e:
+        error_kind = e.kind if isinstance(e, SwapError) else SwapErrorKind.UNKNOWN
+        record_provider_error(
+            request, error_kind.value, f"{quote_type}_quote", provider=provider
+        )
+        raise
+    finally:
+        if not cancelled:
+            duration = time.perf_counter() - start_time
+            record_quote_metrics(
+                request, quote_type, duration, success, provider=provider
+            )
+
+
 def record_status_request(
     request: SwapStatusRequest,
     response: SwapStatusResponse,
@@ -302,6 +302,8 @@ class SwapStatusRequest(SwapBaseModel):
 class NetworkFee(SwapBaseModel):
     """Network fee information for a transaction."""
 
+    model_config = ConfigDict(frozen=True)
+
     amount: str = Field(description="Fee amount in smallest unit (wei, lamports, etc.)")
     decimals: int = Field(description="Decimals for the fee token")
     symbol: str = Field(description="Symbol of the fee token (e.g., 'ETH', 'SOL')")
@@ -434,7 +436,12 @@ class SwapRouteStep(SwapBaseModel):
 
 
 class SwapRoute(SwapBaseModel):
-    """A complete swap route with one or more steps."""
+    """A complete swap route with one or more steps.
+
+    Routes are immutable once built, so sort keys derived from them stay valid.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     id: str = Field(description="Unique route identifier")
     provider: SwapProviderEnum = Field(description="Provider for this route")
@@ -64,6 +64,7 @@ class JupiterClient(BaseSwapProvider):
 
         return create_http_client(
             timeout=10.0,
+            shared_pool=True,
             headers=headers,
         )
 
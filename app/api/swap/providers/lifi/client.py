@@ -73,6 +73,7 @@ class LifiClient(BaseSwapProvider):
 
         return create_http_client(
             timeout=10.0,
+            shared_pool=True,
             headers=headers,
         )
 
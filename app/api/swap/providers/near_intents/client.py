@@ -76,6 +76,7 @@ class NearIntentsClient(BaseSwapProvider):
 
         return create_http_client(
             timeout=10.0,
+            shared_pool=True,
             headers={"Authorization": f"Bearer {self.jwt_token}"},
         )
 
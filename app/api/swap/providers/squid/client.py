@@ -68,6 +68,7 @@ class SquidClient(BaseSwapProvider):
 
         return create_http_client(
             timeout=10.0,
+            shared_pool=True,
             headers=headers,
         )
 
@@ -84,6 +84,7 @@ class ZeroExClient(BaseSwapProvider):
 
         return create_http_client(
             timeout=10.0,
+            shared_pool=True,
             headers=headers,
         )
 
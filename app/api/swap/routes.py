@@ -1,15 +1,18 @@
-import time
+import functools
+import hashlib
+import re
+from collections.abc import Awaitable, Callable
 
-from fastapi import APIRouter, Depends, FastAPI, Query, Request
+from fastapi import APIRouter, Depends, FastAPI, Query, Request, Response
 from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
 
 from app.api.common.models import Coin, Tags
 from app.api.tokens.manager import TokenManager
 
 from .metrics import (
+    observe_quote,
     record_auto_best_provider,
-    record_provider_error,
-    record_quote_metrics,
     record_status_request,
 )
 from .models import (
@@ -33,6 +36,13 @@ from .utils import (
 
 router = APIRouter(prefix="/api/swap", tags=[Tags.SWAP])
 
+# The provider list is static, so serialize it once instead of running it
+# through response validation and encoding on every request. Aliases are used,
+# as FastAPI does for response models.
+_PROVIDERS_JSON = TypeAdapter(list[SwapProviderInfo]).dump_json(
+    [provider.to_info() for provider in SwapProviderEnum], by_alias=True
+)
+
 
 def setup_swap_error_handler(app: FastAPI):
     async def handler(request: Request, exc: SwapError) -> JSONResponse:
@@ -44,12 +54,80 @@ def setup_swap_error_handler(app: FastAPI):
     app.add_exception_handler(SwapError, handler)
 
 
-@router.get("/v1/providers", response_model=list[SwapProviderInfo])
-async def get_providers() -> list[SwapProviderInfo]:
-    return [provider.to_info() for provider in SwapProviderEnum]
+def handle_swap_errors(failure_message: str, *, value_error_status: int = 400):
+    """Map exceptions escaping a swap route handler to SwapError.
+
+    - SwapError is re-raised as-is
+    - ValueError becomes an UNKNOWN SwapError with value_error_status
+    - Any other exception becomes an UNKNOWN SwapError with status 500
+
+    Args:
+        failure_message: Message prefix for unexpected (500) errors
+        value_error_status: HTTP status code used for ValueError
+    """
+
+    def decorator[**P, R](
+        handler: Callable[P, Awaitable[R]],
+    ) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(handler)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            try:
+                return await handler(*args, **kwargs)
+            except SwapError:
+                raise
+            except ValueError as e:
+                raise SwapError(
+                    message=str(e),
+                    kind=SwapErrorKind.UNKNOWN,
+                    status_code=value_error_status,
+                )
+            except Exception as e:
+                raise SwapError(
+                    message=f"{failure_message}: {e!s}",
+                    kind=SwapErrorKind.UNKNOWN,
+                    status_code=500,
+                )
+
+        return wrapper
+
+    return decorator
+
+
+# An entity-tag, optionally weak, within an If-None-Match list
+_ENTITY_TAG_RE = re.compile(r'(?:W/)?"[^"]*"')
+
+
+def _providers_etag(providers: list[SwapProviderEnum]) -> str:
+    """Return a strong ETag for a provider list, independent of its order."""
+    digest = hashlib.blake2b(
+        ",".join(sorted(p.value for p in providers)).encode(), digest_size=8
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def _if_none_match(header: str | None, etag: str) -> bool:
+    """Evaluate an If-None-Match header against etag (RFC 9110, section 13.1.2).
+
+    Matches "*" or any listed entity-tag, using weak comparison: W/ prefixes are
+    ignored on both sides.
+    """
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        tag.removeprefix("W/") == opaque_tag for tag in _ENTITY_TAG_RE.findall(header)
+    )
+
+
+@router.get("/v1/providers", responses={200: {"model": list[SwapProviderInfo]}})
+async def get_providers() -> Response:
+    return Response(content=_PROVIDERS_JSON, media_type="application/json")
 
 
 @router.get("/v1/providers/supported", response_model=list[SwapProviderEnum])
+@handle_swap_errors("Failed to check provider support")
 async def get_supported_providers(
     source_coin: str = Query(..., description="Source coin (e.g., ETH, SOL, BTC)"),
     source_chain_id: str = Query(..., description="Source chain ID"),
@@ -71,46 +149,49 @@ async def get_supported_providers(
         description="Recipient address on destination chain",
     ),
     token_manager: TokenManager = Depends(TokenManager),
-) -> list[SwapProviderEnum]:
+    *,
+    http_request: Request,
+    response: Response,
+) -> list[SwapProviderEnum] | Response:
     """Returns a list of providers that support the specified token pair swap.
 
     If at least one provider supports the swap, AUTO is also included in the list.
+
+    The response carries an ETag derived from the provider list; requests with a
+    matching If-None-Match header get an empty 304 Not Modified instead. The
+    support probes still run to compute the ETag, so a 304 only saves the body
+    serialization and transfer.
     """
-    try:
-        request = SwapSupportRequest(
-            source_coin=Coin(source_coin.upper()),
-            source_chain_id=source_chain_id,
-            source_token_address=source_token_address,
-            destination_coin=Coin(destination_coin.upper()),
-            destination_chain_id=destination_chain_id,
-            destination_token_address=destination_token_address,
-            recipient=recipient,
-        )
+    request = SwapSupportRequest(
+        source_coin=Coin(source_coin.upper()),
+        source_chain_id=source_chain_id,
+        source_token_address=source_token_address,
+        destination_coin=Coin(destination_coin.upper()),
+        destination_chain_id=destination_chain_id,
+        destination_token_address=destination_token_address,
+        recipient=recipient,
+    )
 
-        clients = await get_supported_provider_clients(request, token_manager)
-        supported_providers = [c.provider_id for c in clients]
+    clients = await get_supported_provider_clients(request, token_manager)
+    supported_providers = [c.provider_id for c in clients]
+    if supported_providers:
+        supported_providers = [SwapProviderEnum.AUTO] + supported_providers
 
-        return (
-            ([SwapProviderEnum.AUTO] + supported_providers)
-            if supported_providers
-            else []
-        )
-    except SwapError:
-        # Re-raise SwapError as-is
-        raise
-    except ValueError as e:
-        raise SwapError(message=str(e), kind=SwapErrorKind.UNKNOWN, status_code=400)
-    except Exception as e:
-        raise SwapError(
-            message=f"Failed to check provider support: {e!s}",
-            kind=SwapErrorKind.UNKNOWN,
-            status_code=500,
-        )
+    etag = _providers_etag(supported_providers)
+    if _if_none_match(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return supported_providers
 
 
 @router.post("/v1/quote/indicative", response_model=SwapQuote)
+@handle_swap_errors("Failed to get indicative quote")
 async def get_indicative_quote(
     request: SwapQuoteRequest,
+    limit: int | None = Query(
+        None, ge=1, description="Maximum number of routes to return"
+    ),
     token_manager: TokenManager = Depends(TokenManager),
 ) -> SwapQuote:
     """Request indicative quotes without creating a deposit address.
@@ -126,48 +207,31 @@ async def get_indicative_quote(
     providers are fetched and combined.
 
     The quotes may not include deposit addresses or expiration times.
-    """
-    start_time = time.perf_counter()
-    success = False
 
-    try:
+    Pass `limit` to receive only the best N routes.
+    """
+    with observe_quote(request, "indicative"):
         # For AUTO mode, fetch routes from all eligible providers
         if request.provider is None or request.provider == SwapProviderEnum.AUTO:
-            routes = await get_all_indicative_routes(request, token_manager)
+            routes = await get_all_indicative_routes(
+                request, token_manager, top_k=limit
+            )
 
             # Record which provider won (first route is best)
             if routes:
                 record_auto_best_provider(request, routes[0].provider)
 
-            success = True
             return SwapQuote(routes=routes)
 
         # For specific provider, get routes from that provider only
         provider = await get_provider_client_for_request(request, token_manager)
-        apply_default_slippage(provider, request)
-
+        request = apply_default_slippage(provider, request)
         routes = await provider.get_indicative_routes(request)
-        success = True
-        return SwapQuote(routes=routes)
-    except SwapError as e:
-        record_provider_error(request, e.kind.value, "indicative_quote")
-        raise
-    except ValueError as e:
-        record_provider_error(request, SwapErrorKind.UNKNOWN.value, "indicative_quote")
-        raise SwapError(message=str(e), kind=SwapErrorKind.UNKNOWN, status_code=400)
-    except Exception as e:
-        record_provider_error(request, SwapErrorKind.UNKNOWN.value, "indicative_quote")
-        raise SwapError(
-            message=f"Failed to get indicative quote: {e!s}",
-            kind=SwapErrorKind.UNKNOWN,
-            status_code=500,
-        )
-    finally:
-        duration = time.perf_counter() - start_time
-        record_quote_metrics(request, "indicative", duration, success)
+        return SwapQuote(routes=routes[:limit])
 
 
 @router.post("/v1/quote/firm", response_model=SwapQuote)
+@handle_swap_errors("Failed to get firm quote")
 async def get_firm_quote(
     request: SwapQuoteRequest,
     token_manager: TokenManager = Depends(TokenManager),
@@ -187,35 +251,14 @@ async def get_firm_quote(
     Important: Save the entire response, including provider metadata,
     as it may contain signatures or other data needed for dispute resolution.
     """
-    start_time = time.perf_counter()
-    success = False
-
-    try:
+    with observe_quote(request, "firm"):
         provider = await get_provider_client_for_request(request, token_manager)
-        apply_default_slippage(provider, request)
-
-        route = await provider.get_firm_route(request)
-        success = True
+        route = await provider.get_firm_route(apply_default_slippage(provider, request))
         return SwapQuote(routes=[route])
-    except SwapError as e:
-        record_provider_error(request, e.kind.value, "firm_quote")
-        raise
-    except ValueError as e:
-        record_provider_error(request, SwapErrorKind.UNKNOWN.value, "firm_quote")
-        raise SwapError(message=str(e), kind=SwapErrorKind.UNKNOWN, status_code=400)
-    except Exception as e:
-        record_provider_error(request, SwapErrorKind.UNKNOWN.value, "firm_quote")
-        raise SwapError(
-            message=f"Failed to get firm quote: {e!s}",
-            kind=SwapErrorKind.UNKNOWN,
-            status_code=500,
-        )
-    finally:
-        duration = time.perf_counter() - start_time
-        record_quote_metrics(request, "firm", duration, success)
 
 
 @router.post("/v1/status", response_model=SwapStatusResponse)
+@handle_swap_errors("Failed to get swap status", value_error_status=404)
 async def get_swap_status(
     request: SwapStatusRequest,
     token_manager: TokenManager = Depends(TokenManager),
@@ -236,19 +279,7 @@ async def get_swap_status(
     5. REFUNDED - Funds have been refunded to the refund address
 
     """
-    try:
-        client = await get_provider_client(request.provider, token_manager)
-        response = await client.get_status(request)
-        record_status_request(request, response)
-        return response
-    except SwapError:
-        # Re-raise SwapError as-is (from provider)
-        raise
-    except ValueError as e:
-        raise SwapError(message=str(e), kind=SwapErrorKind.UNKNOWN, status_code=404)
-    except Exception as e:
-        raise SwapError(
-            message=f"Failed to get swap status: {e!s}",
-            kind=SwapErrorKind.UNKNOWN,
-            status_code=500,
-        )
+    client = get_provider_client(request.provider, token_manager)
+    response = await client.get_status(request)
+    record_status_request(request, response)
+    return response
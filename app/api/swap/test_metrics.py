@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.api.common.models import Coin
+from app.api.swap.metrics import observe_quote
+from app.api.swap.models import (
+    SwapError,
+    SwapErrorKind,
+    SwapProviderEnum,
+    SwapQuoteRequest,
+)
+
+
+def create_mock_request() -> SwapQuoteRequest:
+    return SwapQuoteRequest(
+        source_coin=Coin.SOL,
+        source_chain_id="0x65",
+        source_token_address="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+        destination_coin=Coin.BTC,
+        destination_chain_id="bitcoin_mainnet",
+        recipient="bc1qpjqsdj3qvfl4hzfa49p28ns9xkpl73cyg9exzn",
+        amount="1000000",
+        refund_to="8eekKfUAGSJbq3CdA2TmHb8tKuyzd5gtEas3MYAtXzrT",
+        provider=SwapProviderEnum.AUTO,
+    )
+
+
+def _quote_count(provider: str, status: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "swap_quote_requests_total",
+            {
+                "provider": provider,
+                "quote_type": "indicative",
+                "source_coin": "SOL",
+                "dest_coin": "BTC",
+                "source_chain_id": "0x65",
+                "dest_chain_id": "bitcoin_mainnet",
+                "status": status,
+            },
+        )
+        or 0.0
+    )
+
+
+def _error_count(provider: str, error_kind: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "swap_provider_errors_total",
+            {
+                "provider": provider,
+                "error_kind": error_kind,
+                "operation": "indicative_quote",
+            },
+        )
+        or 0.0
+    )
+
+
+def test_observe_quote_records_success():
+    request = create_mock_request()
+    before = _quote_count("AUTO", "success")
+
+    with observe_quote(request, "indicative"):
+        pass
+
+    assert _quote_count("AUTO", "success") == before + 1
+
+
+@pytest.mark.parametrize(
+    "error,expected_kind",
+    [
+        (SwapError("too low", SwapErrorKind.AMOUNT_TOO_LOW), "AMOUNT_TOO_LOW"),
+        (RuntimeError("boom"), "UNKNOWN"),
+    ],
+)
+def test_observe_quote_records_error_and_reraises(error, expected_kind):
+    request = create_mock_request()
+    quotes_before = _quote_count("LIFI", "error")
+    errors_before = _error_count("LIFI", expected_kind)
+
+    with pytest.raises(type(error)):
+        with observe_quote(request, "indicative", provider="LIFI"):
+            raise error
+
+    assert _quote_count("LIFI", "error") == quotes_before + 1
+    assert _error_count("LIFI", expected_kind) == errors_before + 1
+
+
+def test_observe_quote_skips_cancelled_quotes():
+    request = create_mock_request()
+    errors_before = _quote_count("SQUID", "error")
+    successes_before = _quote_count("SQUID", "success")
+
+    with pytest.raises(asyncio.CancelledError):
+        with observe_quote(request, "indicative", provider="SQUID"):
+            raise asyncio.CancelledError
+
+    assert _quote_count("SQUID", "error") == errors_before
+    assert _quote_count("SQUID", "success") == successes_before
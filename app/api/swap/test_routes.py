@@ -1,47 +1,48 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from fastapi.testclient import TestClient
 
-from app.api.common.models import Coin
+from app.api.swap import routes as swap_routes
 from app.api.swap.models import (
     SwapError,
     SwapErrorKind,
     SwapProviderEnum,
-    SwapRoute,
-    SwapRouteStep,
-    SwapStepToken,
-    SwapTool,
 )
-from app.main import app
-
-client = TestClient(app)
 
 
 @pytest.fixture
-def mock_get_provider_client_for_request():
-    with patch(
-        "app.api.swap.routes.get_provider_client_for_request",
-        new_callable=AsyncMock,
-    ) as mock:
-        yield mock
+def mock_get_provider_client_for_request(monkeypatch):
+    mock = AsyncMock()
+    monkeypatch.setattr(swap_routes, "get_provider_client_for_request", mock)
+    return mock
 
 
-@pytest.fixture
-def mock_get_all_indicative_routes():
-    with patch(
-        "app.api.swap.routes.get_all_indicative_routes",
-        new_callable=AsyncMock,
-    ) as mock:
-        yield mock
+def _async_return(value):
+    """Async stand-in for AsyncMock(return_value=...) where calls aren't inspected."""
+
+    async def _f(*args, **kwargs):
+        return value
+
+    return _f
+
+
+def _async_raise(exc):
+    """Async stand-in for AsyncMock(side_effect=exc) where calls aren't inspected."""
+
+    async def _f(*args, **kwargs):
+        raise exc
+
+    return _f
 
 
 @pytest.fixture
-def mock_token_manager():
-    with patch("app.api.swap.routes.TokenManager") as mock:
-        mock_instance = MagicMock()
-        mock.return_value = mock_instance
-        yield mock_instance
+def mock_token_manager(monkeypatch):
+    mock_instance = MagicMock()
+    monkeypatch.setattr(
+        swap_routes, "TokenManager", MagicMock(return_value=mock_instance)
+    )
+    return mock_instance
 
 
 @pytest.fixture
@@ -50,216 +51,183 @@ def mock_provider_client():
     return mock_client
 
 
-MOCK_REQUEST_DATA = {
-    "sourceCoin": "SOL",
-    "sourceChainId": "mainnet",
-    "sourceTokenAddress": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
-    "destinationCoin": "BTC",
-    "destinationChainId": "mainnet",
-    "destinationTokenAddress": None,
-    "recipient": "bc1qpjqsdj3qvfl4hzfa49p28ns9xkpl73cyg9exzn",
-    "amount": "1000000",
-    "slippagePercentage": "0.5",
-    "swapType": "EXACT_INPUT",
-    "refundTo": "8eekKfUAGSJbq3CdA2TmHb8tKuyzd5gtEas3MYAtXzrT",
-}
-
+MOCK_REQUEST_DATA = MappingProxyType(
+    {
+        "sourceCoin": "SOL",
+        "sourceChainId": "mainnet",
+        "sourceTokenAddress": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+        "destinationCoin": "BTC",
+        "destinationChainId": "mainnet",
+        "destinationTokenAddress": None,
+        "recipient": "bc1qpjqsdj3qvfl4hzfa49p28ns9xkpl73cyg9exzn",
+        "amount": "1000000",
+        "slippagePercentage": "0.5",
+        "swapType": "EXACT_INPUT",
+        "refundTo": "8eekKfUAGSJbq3CdA2TmHb8tKuyzd5gtEas3MYAtXzrT",
+    }
+)
 
-def create_mock_route(
-    route_id: str = "test-route-1",
-    source_amount: str = "1000000",
-    destination_amount: str = "3500",
-    estimated_time: int | None = None,
-):
-    """Helper to create a mock SwapRoute for testing."""
-    return SwapRoute(
-        id=route_id,
-        provider=SwapProviderEnum.NEAR_INTENTS,
-        steps=[
-            SwapRouteStep(
-                source_token=SwapStepToken(
-                    coin=Coin.SOL,
-                    chain_id="0x65",
-                    contract_address="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
-                    symbol="USDC",
-                    decimals=6,
-                    logo=None,
-                ),
-                source_amount=source_amount,
-                destination_token=SwapStepToken(
-                    coin=Coin.BTC,
-                    chain_id="bitcoin_mainnet",
-                    contract_address=None,
-                    symbol="BTC",
-                    decimals=8,
-                    logo=None,
-                ),
-                destination_amount=destination_amount,
-                tool=SwapTool(name="NEAR Intents", logo=None),
-            )
-        ],
-        source_amount=source_amount,
-        destination_amount=destination_amount,
-        destination_amount_min="3450",
-        estimated_time=estimated_time,
-        requires_token_allowance=False,
-        requires_firm_route=True,
-        slippage_percentage="0.5",
-    )
+MOCK_REQUEST_DATA_WITHOUT_SLIPPAGE = MappingProxyType(
+    {k: v for k, v in MOCK_REQUEST_DATA.items() if k != "slippagePercentage"}
+)
 
+_EXPECTED_INDICATIVE_RESPONSE = {
+    "routes": [
+        {
+            "id": "test-route-1",
+            "provider": "NEAR_INTENTS",
+            "steps": [
+                {
+                    "sourceToken": {
+                        "coin": "SOL",
+                        "chainId": "0x65",
+                        "contractAddress": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                        "symbol": "USDC",
+                        "decimals": 6,
+                        "logo": None,
+                    },
+                    "sourceAmount": "1000000",
+                    "destinationToken": {
+                        "coin": "BTC",
+                        "chainId": "bitcoin_mainnet",
+                        "contractAddress": None,
+                        "symbol": "BTC",
+                        "decimals": 8,
+                        "logo": None,
+                    },
+                    "destinationAmount": "3500",
+                    "percent": None,
+                    "tool": {"name": "NEAR Intents", "logo": None},
+                }
+            ],
+            "sourceAmount": "1000000",
+            "destinationAmount": "3500",
+            "destinationAmountMin": "3450",
+            "estimatedTime": None,
+            "priceImpact": None,
+            "networkFee": None,
+            "gasless": False,
+            "depositAddress": None,
+            "depositMemo": None,
+            "expiresAt": None,
+            "transactionParams": None,
+            "requiresTokenAllowance": False,
+            "requiresFirmRoute": True,
+            "slippagePercentage": "0.5",
+        }
+    ]
+}
 
-def test_indicative_quote_insufficient_liquidity_error(
-    mock_get_all_indicative_routes,
-):
-    # Setup mock to raise SwapError with INSUFFICIENT_LIQUIDITY kind
-    error = SwapError(
-        message="Amount is too low for bridge, try at least 1264000",
-        kind=SwapErrorKind.INSUFFICIENT_LIQUIDITY,
-    )
-    mock_get_all_indicative_routes.side_effect = error
 
-    response = client.post(
-        "/api/swap/v1/quote/indicative",
-        json=MOCK_REQUEST_DATA,
+# Error-path tests call the handlers directly: they only check how exceptions
+# are mapped to SwapError, which doesn't need the HTTP stack.
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "endpoint,message,kind",
+    [
+        (
+            "indicative",
+            "Amount is too low for bridge, try at least 1264000",
+            SwapErrorKind.INSUFFICIENT_LIQUIDITY,
+        ),
+        (
+            "firm",
+            "Amount is too small for this swap",
+            SwapErrorKind.INSUFFICIENT_LIQUIDITY,
+        ),
+        ("indicative", "Unexpected error occurred", SwapErrorKind.UNKNOWN),
+        ("firm", "An unexpected error happened", SwapErrorKind.UNKNOWN),
+    ],
+)
+async def test_quote_swap_error(monkeypatch, quote_request, endpoint, message, kind):
+    error = SwapError(message=message, kind=kind)
+    if endpoint == "indicative":
+        # AUTO request: routes come from the fan-out
+        monkeypatch.setattr(
+            swap_routes, "get_all_indicative_routes", _async_raise(error)
+        )
+        handler = swap_routes.get_indicative_quote
+    else:
+        provider_client = SimpleNamespace(
+            has_auto_slippage_support=True, get_firm_route=_async_raise(error)
+        )
+        monkeypatch.setattr(
+            swap_routes,
+            "get_provider_client_for_request",
+            _async_return(provider_client),
+        )
+        handler = swap_routes.get_firm_quote
+
+    with pytest.raises(SwapError) as exc_info:
+        await handler(quote_request, token_manager=MagicMock())
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.message == message
+    assert exc_info.value.kind == kind
+
+
+@pytest.mark.asyncio
+async def test_firm_quote_unexpected_error_maps_to_500(monkeypatch, quote_request):
+    provider_client = SimpleNamespace(
+        has_auto_slippage_support=True,
+        get_firm_route=_async_raise(RuntimeError("connection reset")),
     )
-
-    assert response.status_code == 400
-    error_data = response.json()
-    assert error_data["message"] == "Amount is too low for bridge, try at least 1264000"
-    assert error_data["kind"] == "INSUFFICIENT_LIQUIDITY"
-
-
-def test_firm_quote_insufficient_liquidity_error(
-    mock_get_provider_client_for_request,
-    mock_provider_client,
-    mock_token_manager,
-):
-    error = SwapError(
-        message="Amount is too small for this swap",
-        kind=SwapErrorKind.INSUFFICIENT_LIQUIDITY,
+    monkeypatch.setattr(
+        swap_routes, "get_provider_client_for_request", _async_return(provider_client)
     )
-    mock_provider_client.get_firm_route = AsyncMock(side_effect=error)
-    mock_get_provider_client_for_request.return_value = mock_provider_client
 
-    response = client.post("/api/swap/v1/quote/firm", json=MOCK_REQUEST_DATA)
+    with pytest.raises(SwapError) as exc_info:
+        await swap_routes.get_firm_quote(quote_request, token_manager=MagicMock())
 
-    assert response.status_code == 400
-    error_data = response.json()
-    assert error_data["message"] == "Amount is too small for this swap"
-    assert error_data["kind"] == "INSUFFICIENT_LIQUIDITY"
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.message == "Failed to get firm quote: connection reset"
+    assert exc_info.value.kind == SwapErrorKind.UNKNOWN
 
 
-def test_indicative_quote_unknown_error(
-    mock_get_all_indicative_routes,
-):
-    error = SwapError(
-        message="Unexpected error occurred",
-        kind=SwapErrorKind.UNKNOWN,
+def test_indicative_quote_response(client, monkeypatch, make_route):
+    monkeypatch.setattr(
+        swap_routes,
+        "get_all_indicative_routes",
+        _async_return([make_route()]),
     )
-    mock_get_all_indicative_routes.side_effect = error
 
     response = client.post(
-        "/api/swap/v1/quote/indicative",
-        json=MOCK_REQUEST_DATA,
+        "/api/swap/v1/quote/indicative", json=dict(MOCK_REQUEST_DATA)
     )
 
-    assert response.status_code == 400
-    error_data = response.json()
-    assert error_data["message"] == "Unexpected error occurred"
-    assert error_data["kind"] == "UNKNOWN"
-
-
-def test_firm_quote_unknown_error(
-    mock_get_provider_client_for_request,
-    mock_provider_client,
-    mock_token_manager,
-):
-    error = SwapError(
-        message="An unexpected error happened",
-        kind=SwapErrorKind.UNKNOWN,
-    )
-    mock_provider_client.get_firm_route = AsyncMock(side_effect=error)
-    mock_get_provider_client_for_request.return_value = mock_provider_client
-
-    response = client.post("/api/swap/v1/quote/firm", json=MOCK_REQUEST_DATA)
-
-    assert response.status_code == 400
-    error_data = response.json()
-    assert error_data["message"] == "An unexpected error happened"
-    assert error_data["kind"] == "UNKNOWN"
+    assert response.status_code == 200
+    assert response.json() == _EXPECTED_INDICATIVE_RESPONSE
 
 
-def test_indicative_quote_response(mock_get_all_indicative_routes):
-    mock_get_all_indicative_routes.return_value = [create_mock_route()]
+def test_indicative_quote_limit_is_passed_as_top_k(client, monkeypatch, make_route):
+    mock = AsyncMock(return_value=[make_route()])
+    monkeypatch.setattr(swap_routes, "get_all_indicative_routes", mock)
 
-    response = client.post("/api/swap/v1/quote/indicative", json=MOCK_REQUEST_DATA)
+    response = client.post(
+        "/api/swap/v1/quote/indicative",
+        params={"limit": 2},
+        json=dict(MOCK_REQUEST_DATA),
+    )
 
     assert response.status_code == 200
-    assert response.json() == {
-        "routes": [
-            {
-                "id": "test-route-1",
-                "provider": "NEAR_INTENTS",
-                "steps": [
-                    {
-                        "sourceToken": {
-                            "coin": "SOL",
-                            "chainId": "0x65",
-                            "contractAddress": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
-                            "symbol": "USDC",
-                            "decimals": 6,
-                            "logo": None,
-                        },
-                        "sourceAmount": "1000000",
-                        "destinationToken": {
-                            "coin": "BTC",
-                            "chainId": "bitcoin_mainnet",
-                            "contractAddress": None,
-                            "symbol": "BTC",
-                            "decimals": 8,
-                            "logo": None,
-                        },
-                        "destinationAmount": "3500",
-                        "percent": None,
-                        "tool": {"name": "NEAR Intents", "logo": None},
-                    }
-                ],
-                "sourceAmount": "1000000",
-                "destinationAmount": "3500",
-                "destinationAmountMin": "3450",
-                "estimatedTime": None,
-                "priceImpact": None,
-                "networkFee": None,
-                "gasless": False,
-                "depositAddress": None,
-                "depositMemo": None,
-                "expiresAt": None,
-                "transactionParams": None,
-                "requiresTokenAllowance": False,
-                "requiresFirmRoute": True,
-                "slippagePercentage": "0.5",
-            }
-        ]
-    }
+    assert mock.call_args.kwargs["top_k"] == 2
 
 
 def test_indicative_quote_defaults_slippage_for_non_auto_slippage_providers(
+    client,
     mock_get_provider_client_for_request,
     mock_provider_client,
     mock_token_manager,
+    make_route,
 ):
     """Test that slippage defaults to 0.5% for providers without auto slippage support."""
     # Setup mock provider with no auto slippage support
     mock_provider_client.has_auto_slippage_support = False
-    mock_provider_client.get_indicative_routes = AsyncMock(
-        return_value=[create_mock_route()]
-    )
+    mock_provider_client.get_indicative_routes = AsyncMock(return_value=[make_route()])
     mock_get_provider_client_for_request.return_value = mock_provider_client
 
     # Make request without slippage_percentage, but with a specific provider
-    request_data = MOCK_REQUEST_DATA.copy()
-    request_data.pop("slippagePercentage", None)
-    request_data["provider"] = "NEAR_INTENTS"
+    request_data = {**MOCK_REQUEST_DATA_WITHOUT_SLIPPAGE, "provider": "NEAR_INTENTS"}
 
     response = client.post("/api/swap/v1/quote/indicative", json=request_data)
 
@@ -277,20 +245,20 @@ def test_indicative_quote_defaults_slippage_for_non_auto_slippage_providers(
 
 
 def test_firm_quote_defaults_slippage_for_non_auto_slippage_providers(
+    client,
     mock_get_provider_client_for_request,
     mock_provider_client,
     mock_token_manager,
+    make_route,
 ):
     """Test that slippage defaults to 0.5% for providers without auto slippage support."""
     # Setup mock provider with no auto slippage support
     mock_provider_client.has_auto_slippage_support = False
-    mock_provider_client.get_firm_route = AsyncMock(return_value=create_mock_route())
+    mock_provider_client.get_firm_route = AsyncMock(return_value=make_route())
     mock_get_provider_client_for_request.return_value = mock_provider_client
 
     # Make request without slippage_percentage, but with a specific provider
-    request_data = MOCK_REQUEST_DATA.copy()
-    request_data.pop("slippagePercentage", None)
-    request_data["provider"] = "NEAR_INTENTS"
+    request_data = {**MOCK_REQUEST_DATA_WITHOUT_SLIPPAGE, "provider": "NEAR_INTENTS"}
 
     response = client.post("/api/swap/v1/quote/firm", json=request_data)
 
@@ -308,22 +276,21 @@ def test_firm_quote_defaults_slippage_for_non_auto_slippage_providers(
 
 
 def test_indicative_quote_does_not_default_slippage_for_auto_slippage_providers(
+    client,
     mock_get_provider_client_for_request,
     mock_provider_client,
     mock_token_manager,
+    make_route,
 ):
     """Test that slippage is not defaulted for providers with auto slippage support."""
     # Setup mock provider with auto slippage support
     mock_provider_client.has_auto_slippage_support = True
-    mock_provider_client.get_indicative_routes = AsyncMock(
-        return_value=[create_mock_route()]
-    )
+    mock_provider_client.get_indicative_routes = AsyncMock(return_value=[make_route()])
     mock_get_provider_client_for_request.return_value = mock_provider_client
 
     # Make request without slippage_percentage, but with a specific provider
-    request_data = MOCK_REQUEST_DATA.copy()
-    request_data.pop("slippagePercentage", None)
-    request_data["provider"] = "JUPITER"  # Jupiter supports auto slippage
+    # Jupiter supports auto slippage
+    request_data = {**MOCK_REQUEST_DATA_WITHOUT_SLIPPAGE, "provider": "JUPITER"}
 
     response = client.post("/api/swap/v1/quote/indicative", json=request_data)
 
@@ -338,3 +305,102 @@ def test_indicative_quote_does_not_default_slippage_for_auto_slippage_providers(
 
     # Verify slippage was NOT defaulted (remains None)
     assert request_arg.slippage_percentage is None
+
+
+SUPPORTED_PROVIDERS_PARAMS = {
+    "source_coin": "SOL",
+    "source_chain_id": "0x65",
+    "destination_coin": "SOL",
+    "destination_chain_id": "0x65",
+    "destination_token_address": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+}
+
+
+@pytest.fixture
+def mock_get_supported_provider_clients(monkeypatch):
+    jupiter_client = MagicMock()
+    jupiter_client.provider_id = SwapProviderEnum.JUPITER
+    mock = AsyncMock(return_value=[jupiter_client])
+    monkeypatch.setattr(swap_routes, "get_supported_provider_clients", mock)
+    return mock
+
+
+def test_supported_providers_sets_etag(client, mock_get_supported_provider_clients):
+    response = client.get(
+        "/api/swap/v1/providers/supported", params=SUPPORTED_PROVIDERS_PARAMS
+    )
+
+    assert response.status_code == 200
+    assert response.json() == ["AUTO", "JUPITER"]
+    assert response.headers["etag"]
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [
+        lambda etag: etag,
+        lambda etag: f"W/{etag}",
+        lambda etag: f'"stale", {etag}',
+        lambda etag: "*",
+    ],
+    ids=["exact", "weak", "list", "wildcard"],
+)
+def test_supported_providers_not_modified_on_matching_etag(
+    client,
+    mock_get_supported_provider_clients,
+    if_none_match,
+):
+    first = client.get(
+        "/api/swap/v1/providers/supported", params=SUPPORTED_PROVIDERS_PARAMS
+    )
+    etag = first.headers["etag"]
+
+    response = client.get(
+        "/api/swap/v1/providers/supported",
+        params=SUPPORTED_PROVIDERS_PARAMS,
+        headers={"If-None-Match": if_none_match(etag)},
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_supported_providers_stale_etag_returns_body(
+    client,
+    mock_get_supported_provider_clients,
+):
+    response = client.get(
+        "/api/swap/v1/providers/supported",
+        params=SUPPORTED_PROVIDERS_PARAMS,
+        headers={"If-None-Match": '"stale"'},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == ["AUTO", "JUPITER"]
+
+
+def test_providers_etag_ignores_order():
+    providers = [SwapProviderEnum.AUTO, SwapProviderEnum.JUPITER]
+
+    assert swap_routes._providers_etag(providers) == swap_routes._providers_etag(
+        providers[::-1]
+    )
+
+
+def test_get_providers(client):
+    response = client.get("/api/swap/v1/providers")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == [
+        provider.to_info().model_dump(mode="json", by_alias=True)
+        for provider in SwapProviderEnum
+    ]
+
+
+def test_get_providers_documents_response_model(client):
+    operation = client.get("/openapi.json").json()["paths"]["/api/swap/v1/providers"]
+
+    schema = operation["get"]["responses"]["200"]["content"]["application/json"]
+    assert schema["schema"]["items"]["$ref"].endswith("/SwapProviderInfo")
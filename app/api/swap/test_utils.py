@@ -1,8 +1,11 @@
-from unittest.mock import AsyncMock, patch
+import asyncio
+from collections import defaultdict
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from prometheus_client import REGISTRY
+from pydantic import ValidationError
 
-from app.api.common.models import Coin
 from app.api.swap.constants import DEFAULT_SLIPPAGE_PERCENTAGE
 from app.api.swap.models import (
     NetworkFee,
@@ -10,97 +13,28 @@ from app.api.swap.models import (
     SwapError,
     SwapErrorKind,
     SwapProviderEnum,
-    SwapQuoteRequest,
-    SwapRoute,
-    SwapRouteStep,
-    SwapStepToken,
-    SwapTool,
     SwapType,
 )
 from app.api.swap.utils import (
     apply_default_slippage,
     get_all_indicative_routes,
     get_provider_client_for_request,
+    get_supported_provider_clients,
+    resolve_provider_id,
     sort_routes,
 )
 
-
-def create_mock_route(
-    route_id: str = "test-route-1",
-    source_amount: str = "1000000",
-    destination_amount: str = "3500",
-    estimated_time: int | None = None,
-    network_fee: NetworkFee | None = None,
-    gasless: bool = False,
-):
-    """Helper to create a mock SwapRoute for testing."""
-    return SwapRoute(
-        id=route_id,
-        provider=SwapProviderEnum.NEAR_INTENTS,
-        steps=[
-            SwapRouteStep(
-                source_token=SwapStepToken(
-                    coin=Coin.SOL,
-                    chain_id="0x65",
-                    contract_address="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
-                    symbol="USDC",
-                    decimals=6,
-                    logo=None,
-                ),
-                source_amount=source_amount,
-                destination_token=SwapStepToken(
-                    coin=Coin.BTC,
-                    chain_id="bitcoin_mainnet",
-                    contract_address=None,
-                    symbol="BTC",
-                    decimals=8,
-                    logo=None,
-                ),
-                destination_amount=destination_amount,
-                tool=SwapTool(name="NEAR Intents", logo=None),
-            )
-        ],
-        source_amount=source_amount,
-        destination_amount=destination_amount,
-        destination_amount_min="3450",
-        estimated_time=estimated_time,
-        network_fee=network_fee,
-        gasless=gasless,
-        requires_token_allowance=False,
-        requires_firm_route=True,
-        slippage_percentage="0.5",
-    )
-
-
-def create_mock_request() -> SwapQuoteRequest:
-    """Create a mock SwapQuoteRequest for testing."""
-    return SwapQuoteRequest(
-        source_coin=Coin.SOL,
-        source_chain_id="0x65",
-        source_token_address="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
-        destination_coin=Coin.BTC,
-        destination_chain_id="bitcoin_mainnet",
-        destination_token_address=None,
-        recipient="bc1qpjqsdj3qvfl4hzfa49p28ns9xkpl73cyg9exzn",
-        amount="1000000",
-        slippage_percentage="0.5",
-        swap_type=SwapType.EXACT_INPUT,
-        refund_to="8eekKfUAGSJbq3CdA2TmHb8tKuyzd5gtEas3MYAtXzrT",
-        provider=SwapProviderEnum.AUTO,
-    )
-
-
 # =============================================================================
 # Tests for sort_routes
 # =============================================================================
 
 
-def test_sort_routes_cheapest_exact_input():
+def test_sort_routes_cheapest_exact_input(make_route):
     """CHEAPEST + EXACT_INPUT sorts by highest destination_amount."""
     routes = [
-        create_mock_route("low", destination_amount="1000"),
-        create_mock_route("high", destination_amount="5000"),
-        create_mock_route("mid", destination_amount="3000"),
+        make_route("low", destination_amount="1000"),
+        make_route("high", destination_amount="5000"),
+        make_route("mid", destination_amount="3000"),
     ]
 
     sorted_routes = sort_routes(routes, RoutePriority.CHEAPEST, SwapType.EXACT_INPUT)
@@ -108,12 +42,12 @@ def test_sort_routes_cheapest_exact_input():
     assert [r.id for r in sorted_routes] == ["high", "mid", "low"]
 
 
-def test_sort_routes_cheapest_exact_output():
+def test_sort_routes_cheapest_exact_output(make_route):
     """CHEAPEST + EXACT_OUTPUT sorts by lowest source_amount."""
     routes = [
-        create_mock_route("expensive", source_amount="5000"),
-        create_mock_route("cheap", source_amount="1000"),
-        create_mock_route("mid", source_amount="3000"),
+        make_route("expensive", source_amount="5000"),
+        make_route("cheap", source_amount="1000"),
+        make_route("mid", source_amount="3000"),
     ]
 
     sorted_routes = sort_routes(routes, RoutePriority.CHEAPEST, SwapType.EXACT_OUTPUT)
@@ -121,13 +55,13 @@ def test_sort_routes_cheapest_exact_output():
     assert [r.id for r in sorted_routes] == ["cheap", "mid", "expensive"]
 
 
-def test_sort_routes_fastest():
+def test_sort_routes_fastest(make_route):
     """FASTEST priority sorts by estimated_time ascending, 0 is atomic (fastest), None last."""
     routes = [
-        create_mock_route("slow", estimated_time=300),
-        create_mock_route("no_time", estimated_time=None),
-        create_mock_route("fast", estimated_time=60),
-        create_mock_route("atomic", estimated_time=0),
+        make_route("slow", estimated_time=300),
+        make_route("no_time", estimated_time=None),
+        make_route("fast", estimated_time=60),
+        make_route("atomic", estimated_time=0),
     ]
 
     sorted_routes = sort_routes(routes, RoutePriority.FASTEST)
@@ -135,12 +69,12 @@ def test_sort_routes_fastest():
     assert [r.id for r in sorted_routes] == ["atomic", "fast", "slow", "no_time"]
 
 
-def test_sort_routes_cheapest_tiebreak_by_fastest():
+def test_sort_routes_cheapest_tiebreak_by_fastest(make_route):
     """When destination_amount ties, break by fastest estimated_time."""
     routes = [
-        create_mock_route("slow", destination_amount="5000", estimated_time=300),
-        create_mock_route("fast", destination_amount="5000", estimated_time=60),
-        create_mock_route("no_time", destination_amount="5000", estimated_time=None),
+        make_route("slow", destination_amount="5000", estimated_time=300),
+        make_route("fast", destination_amount="5000", estimated_time=60),
+        make_route("no_time", destination_amount="5000", estimated_time=None),
     ]
 
     sorted_routes = sort_routes(routes, RoutePriority.CHEAPEST, SwapType.EXACT_INPUT)
@@ -148,11 +82,11 @@ def test_sort_routes_cheapest_tiebreak_by_fastest():
     assert [r.id for r in sorted_routes] == ["fast", "slow", "no_time"]
 
 
-def test_sort_routes_fastest_tiebreak_by_cheapest():
+def test_sort_routes_fastest_tiebreak_by_cheapest(make_route):
     """When estimated_time ties, break by cheapest (highest output for EXACT_INPUT)."""
     routes = [
-        create_mock_route("low_output", destination_amount="1000", estimated_time=60),
-        create_mock_route("high_output", destination_amount="5000", estimated_time=60),
+        make_route("low_output", destination_amount="1000", estimated_time=60),
+        make_route("high_output", destination_amount="5000", estimated_time=60),
     ]
 
     sorted_routes = sort_routes(routes, RoutePriority.FASTEST, SwapType.EXACT_INPUT)
@@ -160,20 +94,20 @@ def test_sort_routes_fastest_tiebreak_by_cheapest():
     assert [r.id for r in sorted_routes] == ["high_output", "low_output"]
 
 
-def test_sort_routes_cheapest_exact_input_tiebreak_by_network_fee():
+def test_sort_routes_cheapest_exact_input_tiebreak_by_network_fee(make_route):
     """When destination_amount ties, break by lowest network_fee."""
     routes = [
-        create_mock_route(
+        make_route(
             "high_fee",
             destination_amount="5000",
             network_fee=NetworkFee(amount="100000", decimals=18, symbol="ETH"),
         ),
-        create_mock_route(
+        make_route(
             "low_fee",
             destination_amount="5000",
             network_fee=NetworkFee(amount="10000", decimals=18, symbol="ETH"),
         ),
-        create_mock_route(
+        make_route(
             "no_fee",
             destination_amount="5000",
             network_fee=None,
@@ -186,20 +120,42 @@ def test_sort_routes_cheapest_exact_input_tiebreak_by_network_fee():
     assert [r.id for r in sorted_routes] == ["low_fee", "high_fee", "no_fee"]
 
 
-def test_sort_routes_cheapest_exact_output_tiebreak_by_network_fee():
+def test_sort_routes_network_fee_compared_exactly(make_route):
+    """Fees beyond float precision still order correctly."""
+    routes = [
+        make_route(
+            "higher_fee",
+            network_fee=NetworkFee(
+                amount="1000000000000000001", decimals=18, symbol="ETH"
+            ),
+        ),
+        make_route(
+            "lower_fee",
+            network_fee=NetworkFee(
+                amount="1000000000000000000", decimals=18, symbol="ETH"
+            ),
+        ),
+    ]
+
+    sorted_routes = sort_routes(routes, RoutePriority.CHEAPEST, SwapType.EXACT_INPUT)
+
+    assert [r.id for r in sorted_routes] == ["lower_fee", "higher_fee"]
+
+
+def test_sort_routes_cheapest_exact_output_tiebreak_by_network_fee(make_route):
     """When source_amount ties, break by lowest network_fee."""
     routes = [
-        create_mock_route(
+        make_route(
             "high_fee",
             source_amount="1000",
             network_fee=NetworkFee(amount="50000", decimals=9, symbol="SOL"),
         ),
-        create_mock_route(
+        make_route(
             "low_fee",
             source_amount="1000",
             network_fee=NetworkFee(amount="5000", decimals=9, symbol="SOL"),
         ),
-        create_mock_route(
+        make_route(
             "no_fee",
             source_amount="1000",
             network_fee=None,
@@ -212,15 +168,15 @@ def test_sort_routes_cheapest_exact_output_tiebreak_by_network_fee():
     assert [r.id for r in sorted_routes] == ["low_fee", "high_fee", "no_fee"]
 
 
-def test_sort_routes_cheapest_exact_input_amount_beats_fee():
+def test_sort_routes_cheapest_exact_input_amount_beats_fee(make_route):
     """Higher destination_amount beats lower network_fee for EXACT_INPUT."""
     routes = [
-        create_mock_route(
+        make_route(
             "high_output_high_fee",
             destination_amount="6000",
             network_fee=NetworkFee(amount="100000", decimals=18, symbol="ETH"),
         ),
-        create_mock_route(
+        make_route(
             "low_output_low_fee",
             destination_amount="5000",
             network_fee=NetworkFee(amount="10000", decimals=18, symbol="ETH"),
@@ -236,15 +192,15 @@ def test_sort_routes_cheapest_exact_input_amount_beats_fee():
     ]
 
 
-def test_sort_routes_cheapest_exact_output_amount_beats_fee():
+def test_sort_routes_cheapest_exact_output_amount_beats_fee(make_route):
     """Lower source_amount beats lower network_fee for EXACT_OUTPUT."""
     routes = [
-        create_mock_route(
+        make_route(
             "low_input_high_fee",
             source_amount="900",
             network_fee=NetworkFee(amount="100000", decimals=18, symbol="ETH"),
         ),
-        create_mock_route(
+        make_route(
             "high_input_low_fee",
             source_amount="1000",
             network_fee=NetworkFee(amount="10000", decimals=18, symbol="ETH"),
@@ -257,21 +213,21 @@ def test_sort_routes_cheapest_exact_output_amount_beats_fee():
     assert [r.id for r in sorted_routes] == ["low_input_high_fee", "high_input_low_fee"]
 
 
-def test_sort_routes_gasless_treated_as_zero_fee_exact_input():
+def test_sort_routes_gasless_treated_as_zero_fee_exact_input(make_route):
     """Gasless routes with None network_fee are treated as zero fee for EXACT_INPUT."""
     routes = [
-        create_mock_route(
+        make_route(
             "with_fee",
             destination_amount="5000",
             network_fee=NetworkFee(amount="10000", decimals=18, symbol="ETH"),
         ),
-        create_mock_route(
+        make_route(
             "gasless",
             destination_amount="5000",
             network_fee=None,
             gasless=True,
         ),
-        create_mock_route(
+        make_route(
             "no_fee_info",
             destination_amount="5000",
             network_fee=None,
@@ -285,21 +241,21 @@ def test_sort_routes_gasless_treated_as_zero_fee_exact_input():
     assert [r.id for r in sorted_routes] == ["gasless", "with_fee", "no_fee_info"]
 
 
-def test_sort_routes_gasless_treated_as_zero_fee_exact_output():
+def test_sort_routes_gasless_treated_as_zero_fee_exact_output(make_route):
     """Gasless routes with None network_fee are treated as zero fee for EXACT_OUTPUT."""
     routes = [
-        create_mock_route(
+        make_route(
             "with_fee",
             source_amount="1000",
             network_fee=NetworkFee(amount="5000", decimals=9, symbol="SOL"),
         ),
-        create_mock_route(
+        make_route(
             "gasless",
             source_amount="1000",
             network_fee=None,
             gasless=True,
         ),
-        create_mock_route(
+        make_route(
             "no_fee_info",
             source_amount="1000",
             network_fee=None,
@@ -313,24 +269,98 @@ def test_sort_routes_gasless_treated_as_zero_fee_exact_output():
     assert [r.id for r in sorted_routes] == ["gasless", "with_fee", "no_fee_info"]
 
 
+@pytest.fixture(scope="module")
+def tied_routes(make_route):
+    # Routes are immutable, so parametrized tests can share them
+    return (make_route("first"), make_route("second"), make_route("third"))
+
+
+@pytest.mark.parametrize("priority", [RoutePriority.CHEAPEST, RoutePriority.FASTEST])
+def test_sort_routes_ties_keep_input_order(tied_routes, priority):
+    sorted_routes = sort_routes(tied_routes, priority)
+
+    assert [r.id for r in sorted_routes] == ["first", "second", "third"]
+
+
+@pytest.fixture(scope="module")
+def routes_by_destination_amount(make_route):
+    amounts = ["1000", "6000", "3000", "5000", "2000", "4000"]
+    return tuple(make_route(amount, destination_amount=amount) for amount in amounts)
+
+
+@pytest.mark.parametrize("top_k", [1, 3, 6])
+def test_sort_routes_top_k(routes_by_destination_amount, top_k):
+    sorted_routes = sort_routes(
+        routes_by_destination_amount, RoutePriority.CHEAPEST, top_k=top_k
+    )
+
+    expected = ["6000", "5000", "4000", "3000", "2000", "1000"][:top_k]
+    assert [r.id for r in sorted_routes] == expected
+
+
+def test_sort_routes_input_routes_are_immutable(make_route):
+    route = make_route()
+
+    with pytest.raises(ValidationError):
+        route.destination_amount = "1"
+
+
 # =============================================================================
 # Tests for get_all_indicative_routes
 # =============================================================================
 
 
+def _indicative_quote_count(provider: SwapProviderEnum, status: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "swap_quote_requests_total",
+            {
+                "provider": provider.value,
+                "quote_type": "indicative",
+                "source_coin": "SOL",
+                "dest_coin": "BTC",
+                "source_chain_id": "0x65",
+                "dest_chain_id": "bitcoin_mainnet",
+                "status": status,
+            },
+        )
+        or 0.0
+    )
+
+
+def _provider_error_count(provider: SwapProviderEnum, error_kind: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "swap_provider_errors_total",
+            {
+                "provider": provider.value,
+                "error_kind": error_kind,
+                "operation": "indicative_quote",
+            },
+        )
+        or 0.0
+    )
+
+
+def _patch_supported_clients(*clients):
+    """Patch support probes so that only the given clients support the swap."""
+    by_provider = {client.provider_id: client for client in clients}
+
+    async def probe_support(provider, request, token_manager):
+        return by_provider.get(provider)
+
+    return patch("app.api.swap.utils._probe_support", side_effect=probe_support)
+
+
 @pytest.mark.asyncio
-async def test_get_all_indicative_routes_success_with_routes():
+async def test_get_all_indicative_routes_success_with_routes(make_route, quote_request):
     """When at least one client returns routes, return them successfully."""
     mock_client = AsyncMock()
     mock_client.provider_id = SwapProviderEnum.NEAR_INTENTS
-    mock_client.get_indicative_routes = AsyncMock(return_value=[create_mock_route()])
+    mock_client.get_indicative_routes = AsyncMock(return_value=[make_route()])
 
-    with patch(
-        "app.api.swap.utils.get_supported_provider_clients",
-        new_callable=AsyncMock,
-        return_value=[mock_client],
-    ):
-        request = create_mock_request()
+    with _patch_supported_clients(mock_client):
+        request = quote_request
         routes = await get_all_indicative_routes(request, token_manager=None)
 
         assert len(routes) == 1
@@ -338,7 +368,263 @@ async def test_get_all_indicative_routes_success_with_routes():
 
 
 @pytest.mark.asyncio
-async def test_get_all_indicative_routes_success_ignores_failed_clients():
+async def test_get_all_indicative_routes_fastest_cancels_slow_clients(
+    make_route, quote_request
+):
+    """For FASTEST, slow providers are cancelled after the grace period."""
+    slow_cancelled = asyncio.Event()
+
+    async def slow_routes(request):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            slow_cancelled.set()
+            raise
+        return [make_route("slow-provider")]
+
+    fast_client = AsyncMock()
+    fast_client.provider_id = SwapProviderEnum.NEAR_INTENTS
+    fast_client.get_indicative_routes = AsyncMock(
+        return_value=[make_route("fast-provider")]
+    )
+    slow_client = AsyncMock()
+    slow_client.provider_id = SwapProviderEnum.JUPITER
+    slow_client.get_indicative_routes = slow_routes
+
+    quote_request.route_priority = RoutePriority.FASTEST
+    slow_errors_before = _indicative_quote_count(SwapProviderEnum.JUPITER, "error")
+
+    with (
+        _patch_supported_clients(slow_client, fast_client),
+        patch("app.api.swap.utils.FASTEST_ROUTES_GRACE_SECONDS", 0.01),
+    ):
+        routes = await asyncio.wait_for(
+            get_all_indicative_routes(quote_request, token_manager=None), timeout=1
+        )
+
+    assert [r.id for r in routes] == ["fast-provider"]
+    assert slow_cancelled.is_set()
+    # The cancelled straggler did not fail, so no error is recorded for it
+    assert (
+        _indicative_quote_count(SwapProviderEnum.JUPITER, "error") == slow_errors_before
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_all_indicative_routes_defaults_slippage_per_provider(
+    make_route, quote_request
+):
+    """Default slippage applied for one provider must not leak to another."""
+    fixed_client = AsyncMock()
+    fixed_client.provider_id = SwapProviderEnum.NEAR_INTENTS
+    fixed_client.has_auto_slippage_support = False
+    fixed_client.get_indicative_routes = AsyncMock(return_value=[make_route("a")])
+    auto_client = AsyncMock()
+    auto_client.provider_id = SwapProviderEnum.JUPITER
+    auto_client.has_auto_slippage_support = True
+    auto_client.get_indicative_routes = AsyncMock(return_value=[make_route("b")])
+
+    quote_request.slippage_percentage = None
+
+    with _patch_supported_clients(fixed_client, auto_client):
+        await get_all_indicative_routes(quote_request, token_manager=None)
+
+    fixed_request = fixed_client.get_indicative_routes.call_args.args[0]
+    auto_request = auto_client.get_indicative_routes.call_args.args[0]
+    assert fixed_request.slippage_percentage == DEFAULT_SLIPPAGE_PERCENTAGE
+    assert auto_request.slippage_percentage is None
+    assert quote_request.slippage_percentage is None
+
+
+@pytest.mark.asyncio
+async def test_get_all_indicative_routes_reuses_recent_results(
+    make_route, quote_request
+):
+    """Identical requests within the TTL reuse routes; different ones refetch."""
+    mock_client = AsyncMock()
+    mock_client.provider_id = SwapProviderEnum.NEAR_INTENTS
+    mock_client.get_indicative_routes = AsyncMock(return_value=[make_route()])
+
+    with _patch_supported_clients(mock_client):
+        first = await get_all_indicative_routes(quote_request, token_manager=None)
+        second = await get_all_indicative_routes(
+            quote_request.model_copy(), token_manager=None
+        )
+        await get_all_indicative_routes(
+            quote_request.model_copy(update={"amount": "2000000"}),
+            token_manager=None,
+        )
+
+    assert first == second
+    assert first is not second
+    assert mock_client.get_indicative_routes.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_all_indicative_routes_cancellation_reaches_providers(quote_request):
+    """Cancelling the quote request cancels in-flight provider fetches."""
+    started = asyncio.Event()
+    provider_cancelled = asyncio.Event()
+
+    async def slow_routes(request):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            provider_cancelled.set()
+            raise
+        return []
+
+    slow_client = AsyncMock()
+    slow_client.provider_id = SwapProviderEnum.NEAR_INTENTS
+    slow_client.get_indicative_routes = slow_routes
+
+    with _patch_supported_clients(slow_client):
+        task = asyncio.create_task(
+            get_all_indicative_routes(quote_request, token_manager=None)
+        )
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert provider_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_get_all_indicative_routes_single_route_skips_sort(
+    make_route, quote_request
+):
+    mock_client = AsyncMock()
+    mock_client.provider_id = SwapProviderEnum.NEAR_INTENTS
+    mock_client.get_indicative_routes = AsyncMock(return_value=[make_route("only")])
+
+    with (
+        _patch_supported_clients(mock_client),
+        patch("app.api.swap.utils.sort_routes") as mock_sort,
+    ):
+        routes = await get_all_indicative_routes(quote_request, token_manager=None)
+
+    assert [r.id for r in routes] == ["only"]
+    mock_sort.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_all_indicative_routes_fetch_does_not_wait_for_other_probes(
+    make_route, quote_request
+):
+    """A supported provider fetches routes while other support probes are pending."""
+    fetch_started = asyncio.Event()
+
+    async def get_indicative_routes(request):
+        fetch_started.set()
+        return [make_route()]
+
+    fast_client = MagicMock()
+    fast_client.provider_id = SwapProviderEnum.NEAR_INTENTS
+    fast_client.base_url = "https://fast.example.com"
+    fast_client.has_support = AsyncMock(return_value=True)
+    fast_client.get_indicative_routes = get_indicative_routes
+
+    async def slow_has_support(request):
+        # Only resolves once the other provider has started fetching routes
+        await fetch_started.wait()
+        return False
+
+    def fake_get_provider_client(provider, token_manager):
+        if provider == SwapProviderEnum.NEAR_INTENTS:
+            return fast_client
+        client = MagicMock()
+        client.provider_id = provider
+        client.base_url = "https://slow.example.com"
+        client.has_support = slow_has_support
+        return client
+
+    with patch(
+        "app.api.swap.utils.get_provider_client",
+        side_effect=fake_get_provider_client,
+    ):
+        routes = await asyncio.wait_for(
+            get_all_indicative_routes(quote_request, token_manager=None), timeout=1
+        )
+
+    assert [r.id for r in routes] == ["test-route-1"]
+
+
+@pytest.mark.asyncio
+async def test_get_all_indicative_routes_bounds_provider_fanout(
+    make_route, quote_request
+):
+    """Route fetches for a request never exceed PROVIDER_FANOUT_LIMIT."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get_indicative_routes(request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return [make_route()]
+
+    clients = []
+    for provider in (SwapProviderEnum.NEAR_INTENTS, SwapProviderEnum.JUPITER):
+        client = AsyncMock()
+        client.provider_id = provider
+        client.get_indicative_routes = get_indicative_routes
+        clients.append(client)
+
+    with (
+        _patch_supported_clients(*clients),
+        patch("app.api.swap.utils.settings.PROVIDER_FANOUT_LIMIT", 1),
+    ):
+        routes = await get_all_indicative_routes(quote_request, token_manager=None)
+
+    assert len(routes) == 2
+    assert max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_get_all_indicative_routes_fanout_wait_times_out(
+    make_route, quote_request
+):
+    """A provider that can't get a fan-out slot in time fails with TIMEOUT."""
+
+    async def slow_routes(request):
+        # Holds the only slot past the wait timeout
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream failed")
+
+    slow_client = AsyncMock()
+    slow_client.provider_id = SwapProviderEnum.NEAR_INTENTS
+    slow_client.get_indicative_routes = slow_routes
+    queued_client = AsyncMock()
+    queued_client.provider_id = SwapProviderEnum.JUPITER
+    queued_client.get_indicative_routes = AsyncMock(return_value=[make_route()])
+    timeouts_before = _provider_error_count(SwapProviderEnum.JUPITER, "TIMEOUT")
+
+    with (
+        _patch_supported_clients(slow_client, queued_client),
+        patch("app.api.swap.utils.settings.PROVIDER_FANOUT_LIMIT", 1),
+        patch("app.api.swap.utils.PROVIDER_FANOUT_WAIT_SECONDS", 0.01),
+        pytest.raises(SwapError) as exc_info,
+    ):
+        await asyncio.wait_for(
+            get_all_indicative_routes(quote_request, token_manager=None), timeout=1
+        )
+
+    assert exc_info.value.kind == SwapErrorKind.TIMEOUT
+    queued_client.get_indicative_routes.assert_not_called()
+    assert (
+        _provider_error_count(SwapProviderEnum.JUPITER, "TIMEOUT")
+        == timeouts_before + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_all_indicative_routes_success_ignores_failed_clients(
+    make_route, quote_request
+):
     """When some clients fail but at least one succeeds, return routes without raising."""
     # Client 1: fails with exception
     failing_client = AsyncMock()
@@ -351,15 +637,11 @@ async def test_get_all_indicative_routes_success_ignores_failed_clients():
     success_client = AsyncMock()
     success_client.provider_id = SwapProviderEnum.JUPITER
     success_client.get_indicative_routes = AsyncMock(
-        return_value=[create_mock_route("success-route")]
+        return_value=[make_route("success-route")]
     )
 
-    with patch(
-        "app.api.swap.utils.get_supported_provider_clients",
-        new_callable=AsyncMock,
-        return_value=[failing_client, success_client],
-    ):
-        request = create_mock_request()
+    with _patch_supported_clients(failing_client, success_client):
+        request = quote_request
         routes = await get_all_indicative_routes(request, token_manager=None)
 
         # Should succeed with routes from the working client
@@ -414,23 +696,21 @@ async def test_get_all_indicative_routes_success_ignores_failed_clients():
     ],
 )
 async def test_get_all_indicative_routes_raises_most_specific_error(
-    errors, expected_exc_type, expected_message, expected_kind
+    errors, expected_exc_type, expected_message, expected_kind, quote_request
 ):
     """When all providers fail, raise the most specific error:
     specific SwapError > UNKNOWN SwapError > generic Exception."""
     clients = []
     for i, error in enumerate(errors):
         client = AsyncMock()
-        client.provider_id = list(SwapProviderEnum)[i]
+        client.provider_id = (SwapProviderEnum.NEAR_INTENTS, SwapProviderEnum.JUPITER)[
+            i
+        ]
         client.get_indicative_routes = AsyncMock(side_effect=error)
         clients.append(client)
 
-    with patch(
-        "app.api.swap.utils.get_supported_provider_clients",
-        new_callable=AsyncMock,
-        return_value=clients,
-    ):
-        request = create_mock_request()
+    with _patch_supported_clients(*clients):
+        request = quote_request
 
         with pytest.raises(expected_exc_type) as exc_info:
             await get_all_indicative_routes(request, token_manager=None)
@@ -443,14 +723,12 @@ async def test_get_all_indicative_routes_raises_most_specific_error(
 
 
 @pytest.mark.asyncio
-async def test_get_all_indicative_routes_raises_swap_error_when_no_clients():
+async def test_get_all_indicative_routes_raises_swap_error_when_no_clients(
+    quote_request,
+):
     """When no clients support the swap, raise SwapError with UNSUPPORTED_TOKENS."""
-    with patch(
-        "app.api.swap.utils.get_supported_provider_clients",
-        new_callable=AsyncMock,
-        return_value=[],  # No clients support the swap
-    ):
-        request = create_mock_request()
+    with _patch_supported_clients():
+        request = quote_request
 
         with pytest.raises(SwapError) as exc_info:
             await get_all_indicative_routes(request, token_manager=None)
@@ -460,18 +738,16 @@ async def test_get_all_indicative_routes_raises_swap_error_when_no_clients():
 
 
 @pytest.mark.asyncio
-async def test_get_all_indicative_routes_raises_swap_error_when_empty_routes_no_exceptions():
+async def test_get_all_indicative_routes_raises_swap_error_when_empty_routes_no_exceptions(
+    quote_request,
+):
     """When clients return empty routes with no exceptions, raise SwapError with UNSUPPORTED_TOKENS."""
     mock_client = AsyncMock()
     mock_client.provider_id = SwapProviderEnum.NEAR_INTENTS
     mock_client.get_indicative_routes = AsyncMock(return_value=[])  # Empty routes
 
-    with patch(
-        "app.api.swap.utils.get_supported_provider_clients",
-        new_callable=AsyncMock,
-        return_value=[mock_client],
-    ):
-        request = create_mock_request()
+    with _patch_supported_clients(mock_client):
+        request = quote_request
 
         with pytest.raises(SwapError) as exc_info:
             await get_all_indicative_routes(request, token_manager=None)
@@ -480,23 +756,109 @@ async def test_get_all_indicative_routes_raises_swap_error_when_empty_routes_no_
         assert "No provider supports this swap" in exc_info.value.message
 
 
+# =============================================================================
+# Tests for get_supported_provider_clients
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_get_supported_provider_clients_skips_unsupported_and_failing(
+    quote_request, caplog
+):
+    """Only supporting clients are returned, in provider order; errors are skipped."""
+
+    def make_client(provider: SwapProviderEnum) -> MagicMock:
+        client = MagicMock()
+        client.provider_id = provider
+        client.base_url = f"https://{provider.value.lower()}.example.com"
+        client.has_support = AsyncMock(return_value=True)
+        return client
+
+    clients = {
+        p: make_client(p) for p in SwapProviderEnum if p != SwapProviderEnum.AUTO
+    }
+    clients[SwapProviderEnum.ZERO_EX].has_support = AsyncMock(return_value=False)
+    clients[SwapProviderEnum.LIFI].has_support = AsyncMock(
+        side_effect=RuntimeError("boom")
+    )
+    clients[SwapProviderEnum.SQUID].has_support = AsyncMock(
+        side_effect=NotImplementedError
+    )
+
+    def fake_get_provider_client(provider, token_manager):
+        return clients[provider]
+
+    with patch(
+        "app.api.swap.utils.get_provider_client",
+        side_effect=fake_get_provider_client,
+    ):
+        result = await get_supported_provider_clients(quote_request, token_manager=None)
+
+    assert [c.provider_id for c in result] == [
+        SwapProviderEnum.NEAR_INTENTS,
+        SwapProviderEnum.JUPITER,
+    ]
+    # Unimplemented probes are skipped silently; only real failures warn
+    assert [r.getMessage() for r in caplog.records if r.levelname == "WARNING"] == [
+        "Error checking support for LIFI: boom"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_supported_provider_clients_bounds_probes_per_host(quote_request):
+    """Probes against the same host never exceed the per-host limit."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def has_support(request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return True
+
+    def fake_get_provider_client(provider, token_manager):
+        client = MagicMock()
+        client.provider_id = provider
+        client.base_url = "https://shared.example.com"
+        client.has_support = has_support
+        return client
+
+    with (
+        patch(
+            "app.api.swap.utils.get_provider_client",
+            side_effect=fake_get_provider_client,
+        ),
+        patch(
+            "app.api.swap.utils._host_semaphores",
+            defaultdict(lambda: asyncio.Semaphore(1)),
+        ),
+    ):
+        result = await get_supported_provider_clients(quote_request, token_manager=None)
+
+    assert len(result) == len(SwapProviderEnum) - 1
+    assert max_in_flight == 1
+
+
 # =============================================================================
 # Tests for get_provider_client_for_request
 # =============================================================================
 
 
 @pytest.mark.asyncio
-async def test_get_provider_client_for_request_unsupported_swap_raises_swap_error():
+async def test_get_provider_client_for_request_unsupported_swap_raises_swap_error(
+    quote_request,
+):
     """When the provider doesn't support the swap, raise SwapError with UNSUPPORTED_TOKENS."""
     mock_client = AsyncMock()
     mock_client.has_support = AsyncMock(return_value=False)
 
-    request = create_mock_request()
+    request = quote_request
     request.provider = SwapProviderEnum.NEAR_INTENTS
 
     with patch(
         "app.api.swap.utils.get_provider_client",
-        new_callable=AsyncMock,
         return_value=mock_client,
     ):
         with pytest.raises(SwapError) as exc_info:
@@ -506,6 +868,18 @@ async def test_get_provider_client_for_request_unsupported_swap_raises_swap_erro
         assert "NEAR_INTENTS" in exc_info.value.message
 
 
+@pytest.mark.parametrize("provider", [SwapProviderEnum.AUTO, None])
+def test_resolve_provider_id_rejects_non_concrete_provider(provider):
+    with pytest.raises(SwapError) as exc_info:
+        resolve_provider_id(provider)
+
+    assert exc_info.value.kind == SwapErrorKind.INVALID_REQUEST
+
+
+def test_resolve_provider_id_returns_concrete_provider():
+    assert resolve_provider_id(SwapProviderEnum.LIFI) == SwapProviderEnum.LIFI
+
+
 @pytest.mark.parametrize(
     "input_slippage,auto_slippage,expected",
     [
@@ -521,14 +895,15 @@ async def test_get_provider_client_for_request_unsupported_swap_raises_swap_erro
     ],
 )
 def test_apply_default_slippage_normalizes_empty(
-    input_slippage, auto_slippage, expected
+    input_slippage, auto_slippage, expected, quote_request
 ):
     provider = AsyncMock()
     provider.has_auto_slippage_support = auto_slippage
 
-    request = create_mock_request()
-    request.slippage_percentage = input_slippage
+    request = quote_request.model_copy(update={"slippage_percentage": input_slippage})
 
-    apply_default_slippage(provider, request)
+    result = apply_default_slippage(provider, request)
 
-    assert request.slippage_percentage == expected
+    assert result.slippage_percentage == expected
+    # The shared request is never mutated
+    assert request.slippage_percentage == input_slippage
@@ -1,11 +1,25 @@
 import asyncio
+import heapq
+import itertools
 import logging
-import time
+import math
+from collections import defaultdict
+from collections.abc import Iterable
+from urllib.parse import urlsplit
 
-from app.api.tokens.manager import TokenManager
+from cachetools import TTLCache
 
-from .constants import DEFAULT_SLIPPAGE_PERCENTAGE
-from .metrics import record_provider_error, record_quote_metrics
+from app.api.tokens.manager import TokenManager
+from app.config import settings
+
+from .constants import (
+    DEFAULT_SLIPPAGE_PERCENTAGE,
+    FASTEST_ROUTES_GRACE_SECONDS,
+    INDICATIVE_ROUTES_CACHE_TTL_SECONDS,
+    MAX_SUPPORT_PROBES_PER_HOST,
+    PROVIDER_FANOUT_WAIT_SECONDS,
+)
+from .metrics import observe_quote, record_provider_error
 from .models import (
     RoutePriority,
     SwapError,
@@ -25,15 +39,45 @@ from .providers.zero_ex.client import ZeroExClient
 
 logger = logging.getLogger(__name__)
 
+# Client class for each concrete provider (everything except AUTO)
+_PROVIDER_CLIENTS: dict[SwapProviderEnum, type[BaseSwapProvider]] = {
+    SwapProviderEnum.NEAR_INTENTS: NearIntentsClient,
+    SwapProviderEnum.ZERO_EX: ZeroExClient,
+    SwapProviderEnum.JUPITER: JupiterClient,
+    SwapProviderEnum.LIFI: LifiClient,
+    SwapProviderEnum.SQUID: SquidClient,
+}
+
+# Providers that can be instantiated, in enum order
+_CONCRETE_PROVIDERS: tuple[SwapProviderEnum, ...] = tuple(_PROVIDER_CLIENTS)
+
+# Sorted AUTO indicative routes keyed by the serialized request and top_k.
+# Routes are immutable, so cached lists can be shared between requests.
+_indicative_routes_cache: TTLCache[tuple[str, int | None], list[SwapRoute]] = TTLCache(
+    maxsize=256, ttl=INDICATIVE_ROUTES_CACHE_TTL_SECONDS
+)
+
+# Per-host semaphores bounding concurrent support probes. Providers sharing an
+# upstream host share a semaphore.
+_host_semaphores: defaultdict[str, asyncio.Semaphore] = defaultdict(
+    lambda: asyncio.Semaphore(MAX_SUPPORT_PROBES_PER_HOST)
+)
 
-async def get_provider_client(
+
+def _provider_host(client: BaseSwapProvider) -> str:
+    """Return the upstream host a provider client talks to."""
+    return urlsplit(getattr(client, "base_url", "")).netloc
+
+
+def get_provider_client(
     provider: SwapProviderEnum,
     token_manager: TokenManager,
 ) -> BaseSwapProvider:
     """Get a provider client instance by provider enum.
 
     Use this when you have a known provider and don't need support checks
-    (e.g., for status lookups or post-submit hooks).
+    (e.g., for status lookups or post-submit hooks). Client construction does
+    no I/O, so this is a plain synchronous lookup.
 
     Args:
         provider: The SwapProviderEnum (must not be AUTO)
@@ -44,7 +88,6 @@ async def get_provider_client(
 
     Raises:
         SwapError: If provider is AUTO or unknown
-        NotImplementedError: If provider is not yet implemented
 
     """
     if provider == SwapProviderEnum.AUTO:
@@ -52,20 +95,39 @@ async def get_provider_client(
             message="AUTO is not a concrete provider",
             kind=SwapErrorKind.INVALID_REQUEST,
         )
-    if provider == SwapProviderEnum.NEAR_INTENTS:
-        return NearIntentsClient(token_manager=token_manager)
-    if provider == SwapProviderEnum.ZERO_EX:
-        return ZeroExClient(token_manager=token_manager)
-    if provider == SwapProviderEnum.JUPITER:
-        return JupiterClient(token_manager=token_manager)
-    if provider == SwapProviderEnum.LIFI:
-        return LifiClient(token_manager=token_manager)
-    if provider == SwapProviderEnum.SQUID:
-        return SquidClient(token_manager=token_manager)
-    raise SwapError(
-        message=f"Unknown provider: {provider}",
-        kind=SwapErrorKind.INVALID_REQUEST,
-    )
+    client_cls = _PROVIDER_CLIENTS.get(provider)
+    if client_cls is None:
+        raise SwapError(
+            message=f"Unknown provider: {provider}",
+            kind=SwapErrorKind.INVALID_REQUEST,
+        )
+    return client_cls(token_manager=token_manager)
+
+
+def resolve_provider_id(provider: SwapProviderEnum | None) -> SwapProviderEnum:
+    """Resolve the explicit provider requested for a quote.
+
+    Args:
+        provider: The provider from the swap quote request
+
+    Returns:
+        The concrete SwapProviderEnum
+
+    Raises:
+        SwapError: If provider is AUTO or None
+
+    """
+    if provider == SwapProviderEnum.AUTO:
+        raise SwapError(
+            message="AUTO provider is not allowed. Please specify a provider.",
+            kind=SwapErrorKind.INVALID_REQUEST,
+        )
+    if provider is None:
+        raise SwapError(
+            message="No provider specified. Please specify a provider.",
+            kind=SwapErrorKind.INVALID_REQUEST,
+        )
+    return provider
 
 
 async def get_provider_client_for_request(
@@ -88,18 +150,8 @@ async def get_provider_client_for_request(
         SwapError: If provider is AUTO, None, or doesn't support the swap
 
     """
-    if request.provider == SwapProviderEnum.AUTO:
-        raise SwapError(
-            message="AUTO provider is not allowed. Please specify a provider.",
-            kind=SwapErrorKind.INVALID_REQUEST,
-        )
-    if request.provider is None:
-        raise SwapError(
-            message="No provider specified. Please specify a provider.",
-            kind=SwapErrorKind.INVALID_REQUEST,
-        )
-
-    client = await get_provider_client(request.provider, token_manager)
+    provider = resolve_provider_id(request.provider)
+    client = get_provider_client(provider, token_manager)
 
     support_request = SwapSupportRequest(
         source_coin=request.source_coin,
@@ -112,7 +164,7 @@ async def get_provider_client_for_request(
     )
     if not await client.has_support(support_request):
         raise SwapError(
-            message=f"Provider {request.provider.value} does not support this swap",
+            message=f"Provider {provider.value} does not support this swap",
             kind=SwapErrorKind.UNSUPPORTED_TOKENS,
         )
     return client
@@ -121,20 +173,28 @@ async def get_provider_client_for_request(
 def apply_default_slippage(
     provider: BaseSwapProvider,
     request: SwapQuoteRequest,
-) -> None:
+) -> SwapQuoteRequest:
     """Apply default slippage to request if provider doesn't support auto slippage.
 
-    Modifies the request in-place if slippage_percentage is None and the provider
-    doesn't support automatic slippage computation.
+    Returns a copy with the default slippage if slippage_percentage is empty and
+    the provider doesn't support automatic slippage computation, otherwise the
+    request itself. The request is never mutated, since AUTO fan-outs share it
+    between providers concurrently.
 
     Args:
         provider: The swap provider client
-        request: The swap quote request to potentially modify
+        request: The swap quote request
+
+    Returns:
+        The request to send to this provider
     """
     if not provider.has_auto_slippage_support and (
         request.slippage_percentage is None or not request.slippage_percentage.strip()
     ):
-        request.slippage_percentage = DEFAULT_SLIPPAGE_PERCENTAGE
+        return request.model_copy(
+            update={"slippage_percentage": DEFAULT_SLIPPAGE_PERCENTAGE}
+        )
+    return request
 
 
 async def get_supported_provider_clients(
@@ -144,7 +204,8 @@ async def get_supported_provider_clients(
     """Get provider clients that support the specified swap.
 
     Returns instantiated clients for providers that support the swap,
-    avoiding the need to re-instantiate them later.
+    avoiding the need to re-instantiate them later. Support checks run
+    concurrently, bounded per provider host.
 
     Args:
         request: The swap support request
@@ -154,32 +215,58 @@ async def get_supported_provider_clients(
         List of BaseSwapProvider clients that support the swap
 
     """
-    supported_clients: list[BaseSwapProvider] = []
+    results = await asyncio.gather(
+        *[
+            _probe_support(provider, request, token_manager)
+            for provider in _CONCRETE_PROVIDERS
+        ]
+    )
+    return [client for client in results if client is not None]
 
-    for provider in SwapProviderEnum:
-        if provider == SwapProviderEnum.AUTO:
-            continue
-        try:
-            client = await get_provider_client(provider, token_manager)
-            if await client.has_support(request):
-                supported_clients.append(client)
-        except NotImplementedError:
-            continue
-        except Exception as e:
-            logger.warning(f"Error checking support for {provider.value}: {e}")
-            continue
 
-    return supported_clients
+async def _probe_support(
+    provider: SwapProviderEnum,
+    request: SwapSupportRequest,
+    token_manager: TokenManager,
+) -> BaseSwapProvider | None:
+    """Return the provider client if it supports the swap, None otherwise.
+
+    Probes are bounded per upstream host by _host_semaphores.
+    """
+    try:
+        client = get_provider_client(provider, token_manager)
+        async with _host_semaphores[_provider_host(client)]:
+            if await client.has_support(request):
+                return client
+    except NotImplementedError:
+        # Provider doesn't implement this yet; not an error worth logging
+        pass
+    except Exception as e:
+        logger.warning(f"Error checking support for {provider.value}: {e}")
+    return None
 
 
 async def get_all_indicative_routes(
     request: SwapQuoteRequest,
     token_manager: TokenManager,
+    top_k: int | None = None,
 ) -> list[SwapRoute]:
     """Fetch indicative routes from all eligible providers and return sorted by best rate.
 
-    Uses get_supported_provider_clients to get eligible provider clients, then fetches
-    routes from those in parallel. Routes are sorted by destination_amount (highest first).
+    Each provider is probed for support and, if supported, queried for routes in a
+    single task, so a provider starts fetching routes as soon as its own support check
+    passes rather than after every provider has been probed. Routes are sorted by
+    destination_amount (highest first).
+
+    Successful results are reused for INDICATIVE_ROUTES_CACHE_TTL_SECONDS for
+    identical requests.
+
+    At most settings.PROVIDER_FANOUT_LIMIT providers fetch routes at once for a
+    request. A provider that waits longer than PROVIDER_FANOUT_WAIT_SECONDS for a
+    slot fails with a TIMEOUT error.
+
+    For FASTEST priority, providers still pending FASTEST_ROUTES_GRACE_SECONDS after
+    the first provider returns routes are cancelled and their routes dropped.
 
     If at least one client returns routes, returns them successfully. If no routes are
     returned but there were exceptions, raises the first exception. If no routes and
@@ -188,6 +275,7 @@ async def get_all_indicative_routes(
     Args:
         request: The swap quote request
         token_manager: Token manager instance
+        top_k: If set, only the best top_k routes are returned
 
     Returns:
         List of SwapRoute from all providers, sorted by destination_amount descending
@@ -197,64 +285,103 @@ async def get_all_indicative_routes(
         SwapError: If no provider supports the swap and no exceptions occurred
 
     """
-    clients = await get_supported_provider_clients(request, token_manager)
-
-    if not clients:
-        raise SwapError(
-            message="No provider supports this swap. Please check your token pair and chains.",
-            kind=SwapErrorKind.UNSUPPORTED_TOKENS,
-        )
+    cache_key = (request.model_dump_json(), top_k)
+    if (cached := _indicative_routes_cache.get(cache_key)) is not None:
+        return list(cached)
 
     # Track exceptions from each client
     exceptions: list[Exception] = []
 
-    async def fetch_routes(client: BaseSwapProvider) -> list[SwapRoute]:
-        """Fetch routes from a client, returning empty list and tracking exceptions."""
-        start_time = time.perf_counter()
-        provider_id = client.provider_id.value
-        success = False
+    # Bounds this request's concurrent route fetches. The limit is at least the
+    # provider count by default, so it only queues fetches when lowered.
+    fanout = asyncio.Semaphore(settings.PROVIDER_FANOUT_LIMIT)
 
-        try:
-            # Default slippage for providers that don't support auto slippage
-            apply_default_slippage(client, request)
+    async def fetch_routes(provider: SwapProviderEnum) -> list[SwapRoute]:
+        """Fetch routes from a provider if it supports the swap.
 
-            routes = await client.get_indicative_routes(request)
-            success = True
-            return routes
-        except SwapError as e:
-            logger.warning(f"Error fetching routes from {provider_id}: {e}")
-            record_provider_error(
-                request, e.kind.value, "indicative_quote", provider=provider_id
-            )
-            exceptions.append(e)
+        Returns an empty list for unsupported providers, and for failing ones
+        after tracking the exception.
+        """
+        client = await _probe_support(provider, request, token_manager)
+        if client is None:
             return []
-        except Exception as e:
-            logger.warning(f"Error fetching routes from {provider_id}: {e}")
+
+        provider_id = provider.value
+
+        # Wait for a slot outside observe_quote so queueing isn't recorded as
+        # provider latency
+        try:
+            async with asyncio.timeout(PROVIDER_FANOUT_WAIT_SECONDS):
+                await fanout.acquire()
+        except TimeoutError:
+            logger.warning(f"Timed out waiting to fetch routes from {provider_id}")
+            # Recorded as a provider error, but not as a quote duration, since
+            # the provider was never called
             record_provider_error(
                 request,
-                SwapErrorKind.UNKNOWN.value,
+                SwapErrorKind.TIMEOUT.value,
                 "indicative_quote",
                 provider=provider_id,
             )
-            exceptions.append(e)
-            return []
-        finally:
-            duration = time.perf_counter() - start_time
-            record_quote_metrics(
-                request, "indicative", duration, success, provider=provider_id
+            exceptions.append(
+                SwapError(
+                    message=f"Timed out waiting to fetch routes from {provider_id}",
+                    kind=SwapErrorKind.TIMEOUT,
+                )
             )
+            return []
 
-    # Fetch routes from all clients in parallel
-    results = await asyncio.gather(*[fetch_routes(c) for c in clients])
+        try:
+            with observe_quote(request, "indicative", provider=provider_id):
+                # Default slippage for providers that don't support auto slippage
+                provider_request = apply_default_slippage(client, request)
 
-    # Flatten all routes into a single list
-    all_routes: list[SwapRoute] = []
-    for routes in results:
-        all_routes.extend(routes)
+                return await client.get_indicative_routes(provider_request)
+        except Exception as e:
+            logger.warning(f"Error fetching routes from {provider_id}: {e}")
+            exceptions.append(e)
+            return []
+        finally:
+            fanout.release()
+
+    # Fetch routes from all clients in parallel. The task group waits for (or
+    # cancels) every fetch before returning, including when this coroutine is
+    # itself cancelled, so no provider request outlives the quote request.
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(fetch_routes(p)) for p in _CONCRETE_PROVIDERS]
+
+        if request.route_priority == RoutePriority.FASTEST:
+            # Don't wait on the slowest provider: once one provider has returned
+            # routes, give the rest a short grace period and cancel the stragglers.
+            done: set[asyncio.Task[list[SwapRoute]]] = set()
+            pending = set(tasks)
+            while pending and not any(task.result() for task in done):
+                finished, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                done |= finished
+            if pending:
+                _, pending = await asyncio.wait(
+                    pending, timeout=FASTEST_ROUTES_GRACE_SECONDS
+                )
+            for task in pending:
+                task.cancel()
+
+    # Sort routes straight from the per-provider results, keeping provider order
+    results = [task.result() for task in tasks if not task.cancelled()]
+    all_routes = itertools.chain.from_iterable(results)
+    if sum(map(len, results)) <= 1:
+        # A single route (the common single-provider case) needs no ordering
+        sorted_routes = list(all_routes)
+    else:
+        sorted_routes = sort_routes(
+            all_routes, request.route_priority, request.swap_type, top_k=top_k
+        )
 
     # If we got routes, return them (ignore any exceptions from other clients)
-    if all_routes:
-        return sort_routes(all_routes, request.route_priority, request.swap_type)
+    if sorted_routes:
+        _indicative_routes_cache[cache_key] = sorted_routes
+        return list(sorted_routes)
 
     # No routes - raise the most specific exception.
     # Prefer SwapErrors with a specific kind over UNKNOWN, and SwapErrors
@@ -277,7 +404,7 @@ async def get_all_indicative_routes(
                     best = exc
         raise best
 
-    # No routes, no exceptions - shouldn't happen but handle gracefully
+    # No routes, no exceptions - no provider supports the swap
     raise SwapError(
         message="No provider supports this swap. Please check your token pair and chains.",
         kind=SwapErrorKind.UNSUPPORTED_TOKENS,
@@ -285,9 +412,10 @@ async def get_all_indicative_routes(
 
 
 def sort_routes(
-    routes: list[SwapRoute],
+    routes: Iterable[SwapRoute],
     priority: RoutePriority,
     swap_type: SwapType = SwapType.EXACT_INPUT,
+    top_k: int | None = None,
 ) -> list[SwapRoute]:
     """Sort routes based on the given priority, with tie-breaking by the other priority.
 
@@ -299,48 +427,58 @@ def sort_routes(
     - Primary sort by estimated_time, then cheapest as tiebreaker
 
     Args:
-        routes: List of routes to sort
+        routes: Routes to sort (any iterable; consumed once)
         priority: Primary sort - CHEAPEST or FASTEST
         swap_type: EXACT_INPUT (cheapest = highest output) or EXACT_OUTPUT (cheapest = lowest input)
+        top_k: If set, only the best top_k routes are returned
 
     Returns:
         Sorted list of routes
     """
 
-    def network_fee_key(r: SwapRoute) -> tuple[bool, float]:
-        """Returns (is_none, fee) - None values sort last, lower fee is better.
+    exact_output = swap_type == SwapType.EXACT_OUTPUT
+    fastest_first = priority == RoutePriority.FASTEST
 
-        Gasless routes with None network_fee are treated as zero fee (fee already
-        included in output/input amounts).
-        """
-        if r.network_fee is None:
-            # If gasless, treat as zero fee (fee already included in amounts)
-            if r.gasless:
-                return (False, 0.0)
-            # Otherwise, couldn't compute fee - sort last
-            return (True, 0.0)
-        return (False, float(r.network_fee.amount))
-
-    def cheapest_key(r: SwapRoute) -> tuple[int, tuple[bool, int]]:
-        """Returns (amount_key, network_fee_key) for sorting.
-
-        For EXACT_INPUT: Prefer highest destination_amount (negated for ascending sort)
-        For EXACT_OUTPUT: Prefer lowest source_amount
-        In both cases, lower network fee is better as a tiebreaker.
+    def build_key(i: int, r: SwapRoute) -> tuple:
+        """Build the flat sort key for a route in a single pass.
+
+        Keys are scalars rather than (is_none, value) tuples: missing values map
+        to math.inf, which sorts after every amount. The index keeps the sort
+        stable and ensures ties never fall through to comparing routes.
         """
-        if swap_type == SwapType.EXACT_OUTPUT:
-            # Lower input is better, then lower network fee
-            return (int(r.source_amount), network_fee_key(r))
-        # Higher output is better (negated), then lower network fee
-        return (-int(r.destination_amount), network_fee_key(r))
-
-    def fastest_key(r: SwapRoute) -> tuple[bool, int]:
-        """Returns (is_none, time) - None values sort last."""
-        return (r.estimated_time is None, r.estimated_time or 0)
-
-    if priority == RoutePriority.FASTEST:
-        # Primary: fastest, Secondary: cheapest (including network fee)
-        return sorted(routes, key=lambda r: (fastest_key(r), cheapest_key(r)))
-
-    # CHEAPEST: Primary: cheapest (amount + network fee), Secondary: fastest
-    return sorted(routes, key=lambda r: (cheapest_key(r), fastest_key(r)))
+        # EXACT_OUTPUT: lower input is better.
+        # EXACT_INPUT: higher output is better (negated for ascending sort).
+        amount = int(r.source_amount) if exact_output else -int(r.destination_amount)
+
+        if r.network_fee is not None:
+            # Fees are integers in the smallest unit; parsing as float would lose
+            # precision for wei-sized amounts and could reorder near-equal fees
+            fee = int(r.network_fee.amount)
+        elif r.gasless:
+            # Gasless: treat as zero fee (fee already included in amounts)
+            fee = 0
+        else:
+            # Couldn't compute fee - sort last
+            fee = math.inf
+
+        # Routes without an estimate sort last
+        time = math.inf if r.estimated_time is None else r.estimated_time
+
+        if fastest_first:
+            # Primary: fastest, Secondary: cheapest (amount, then network fee)
+            return (time, amount, fee, i, r)
+        # CHEAPEST: Primary: cheapest (amount, then network fee), Secondary: fastest
+        return (amount, fee, time, i, r)
+
+    # Decorate-sort-undecorate: build each key once and let list.sort compare
+    # flat tuples.
+    keyed = [build_key(i, r) for i, r in enumerate(routes)]
+    if top_k is not None and top_k < len(keyed) // 2:
+        # Selecting a few best routes is cheaper than sorting all of them
+        keyed = heapq.nsmallest(top_k, keyed)
+    else:
+        # Sort and truncate in place rather than building new lists
+        keyed.sort()
+        if top_k is not None:
+            del keyed[top_k:]
+    return [entry[-1] for entry in keyed]
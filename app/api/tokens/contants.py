@@ -1,2 +1,5 @@
 SPL_TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
 SPL_TOKEN_2022_PROGRAM_ID = "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb"
+
+# Search terms shorter than this get no fuzzy (edit distance 2) clause
+MIN_FUZZY_TERM_LENGTH = 4
@@ -1,13 +1,22 @@
+import asyncio
+import functools
 import json
 import logging
 from typing import Literal
 
+from cachetools import TTLCache
+from redis.commands.search import AsyncSearch
 from redis.commands.search.field import TextField
 from redis.commands.search.index_definition import IndexDefinition
 from redis.commands.search.query import Query
+from redis.exceptions import ResponseError
 
 from app.api.common.models import Chain, Coin, TokenInfo, TokenSource, TokenType
-from app.api.tokens.contants import SPL_TOKEN_2022_PROGRAM_ID, SPL_TOKEN_PROGRAM_ID
+from app.api.tokens.contants import (
+    MIN_FUZZY_TERM_LENGTH,
+    SPL_TOKEN_2022_PROGRAM_ID,
+    SPL_TOKEN_PROGRAM_ID,
+)
 from app.api.tokens.models import TokenSearchResponse
 from app.core.cache import Cache
 from app.core.http import create_http_client
@@ -22,18 +31,129 @@ TokenRegistry = dict[str, dict[str, str]]
 TOKEN_SCHEMA_VERSION = "1"
 
 
+@functools.lru_cache(maxsize=256)
+def _build_search_query(query_lower: str) -> str:
+    """Build the RediSearch query string for a normalized search term.
+
+    Cached because clients issue the same searches (typeahead prefixes, popular
+    symbols) over and over.
+    """
+    # Build comprehensive DIALECT 2 compliant search query with multiple matching strategies
+    fuzz = "%" * 2
+
+    # Unified search logic for both single and multi-word queries
+    terms = query_lower.split()
+    search_parts = []
+
+    # Define search fields for different matching strategies
+    fuzzy_prefix_fields = ["name_lower"]
+
+    # 1. Exact symbol matches (highest priority - weight 5.0)
+    if len(terms) == 1:
+        exact_terms = [f"{term}" for term in terms]
+        symbol_exact = f"@symbol_lower:({' '.join(exact_terms)})"
+        search_parts.append(f"({symbol_exact}) => {{ $weight: 5.0; }}")
+
+    # 2. Exact address matches (highest priority - weight 5.0)
+    if len(terms) == 1:
+        exact_terms = [f"{term}" for term in terms]
+        address_exact = f"@address_lower:({' '.join(exact_terms)})"
+        search_parts.append(f"({address_exact}) => {{ $weight: 5.0; }}")
+
+    # 3. Exact name matches (high priority - weight 2.0)
+    if len(terms) >= 1:
+        exact_terms = [f"{term}" for term in terms]
+        name_exact = f"@name_lower:({' '.join(exact_terms)})"
+        search_parts.append(f"({name_exact}) => {{ $weight: 2.0; }}")
+
+    # 4. Prefix/infix matches for name field (lower priority - weight 1.0)
+    if len(terms) >= 1:
+        prefix_terms = [f"*{term}*" for term in terms]
+        for field in fuzzy_prefix_fields:
+            prefix_query = f"@{field}:({' '.join(prefix_terms)})"
+            search_parts.append(f"({prefix_query}) => {{ $weight: 1.0; }}")
+
+    # 5. Fuzzy matches for name field (lowest priority - weight 0.5). Skipped when
+    # any term is short: an edit distance of 2 matches nearly every short word,
+    # and fuzzy matching is the costliest clause to evaluate.
+    if len(terms) >= 1 and min(map(len, terms)) >= MIN_FUZZY_TERM_LENGTH:
+        fuzzy_terms = [f"{fuzz}{term}{fuzz}" for term in terms]
+        for field in fuzzy_prefix_fields:
+            fuzzy_query = f"@{field}:({' '.join(fuzzy_terms)})"
+            search_parts.append(f"({fuzzy_query}) => {{ $weight: 0.5; }}")
+
+    search_query = " | ".join(search_parts)
+
+    if not search_query:
+        search_query = "*"
+
+    return search_query
+
+
+def _is_unknown_index_error(error: ResponseError) -> bool:
+    """Return True if RediSearch rejected a command because the index is missing."""
+    message = str(error).lower()
+    return "unknown index name" in message or "no such index" in message
+
+
 class TokenManager:
     key_prefix = "token"
-    index_name = "token_idx"
+    index_name = "token_idx_v2"
+    # Indexes from earlier schemas, dropped (keeping their documents) when the
+    # current index is created so Redis doesn't maintain both.
+    legacy_index_names = ("token_idx",)
 
     # Metadata keys live outside the "token:*" namespace so _clear_tokens and
     # the search index never touch them.
     schema_version_key = "token_meta:schema_version"
     reseed_lock_key = "token_meta:reseed_lock"
 
+    # Incremented with every write (refresh and add). Cached searches and gets
+    # are keyed on it, so a write on any replica retires them everywhere.
+    generation_key = "token_meta:generation"
+
+    # Recent search responses, keyed by generation, paging and query. Popular
+    # searches ("eth", "usdc") repeat constantly, and the fuzzy clauses are the
+    # costliest part of a search.
+    search_cache_prefix = "token_search"
+    search_cache_ttl = 60
+
+    # Set once the search index is known to exist, so create_index can skip
+    # the FT.INFO probe. The lock keeps concurrent callers from double-creating.
+    _index_ready = False
+    _index_lock = asyncio.Lock()
+
+    # Hash fields read by _as_response; the *_lower copies only serve matching
+    # and aren't sent back with search results.
+    _search_return_fields = (
+        "address",
+        "name",
+        "symbol",
+        "decimals",
+        "logo",
+        "sources",
+        "token_type",
+        "near_intents_asset_id",
+    )
+
     # Pre-computed chain lookup for O(1) access
     _chain_lookup = {chain.chain_id: chain for chain in Chain}
 
+    # Recently read tokens by (generation, key). Token metadata rarely changes,
+    # and swap quotes look up the same popular tokens repeatedly. Misses aren't
+    # cached, so newly added tokens show up immediately.
+    _token_cache: TTLCache[tuple[int, str], TokenInfo] = TTLCache(
+        maxsize=10_000, ttl=300
+    )
+
+    # This replica's view of generation_key. Re-read every few seconds so cache
+    # hits stay free of Redis round-trips; that interval bounds how long a write
+    # on another replica can go unnoticed by get().
+    _generation_cache: TTLCache[str, int] = TTLCache(maxsize=1, ttl=5)
+
+    # Coins by the lowercased value stored in token keys
+    _coin_lookup = {coin.value.lower(): coin for coin in Coin}
+
     @classmethod
     def _merge_into_registry(
         cls, registry: TokenRegistry, key: str, token_data: dict[str, str]
@@ -63,36 +183,53 @@ class TokenManager:
                     continue
                 existing[field] = value
 
-        # Recompute lowercase fields
-        entry = registry[key]
-        entry["name_lower"] = entry.get("name", "").lower()
-        entry["symbol_lower"] = entry.get("symbol", "").lower()
-        entry["address_lower"] = entry.get("address", "").lower()
+            # Recompute lowercase fields. New entries already carry them from
+            # _prepare_token_data.
+            existing["name_lower"] = existing.get("name", "").lower()
+            existing["symbol_lower"] = existing.get("symbol", "").lower()
+            existing["address_lower"] = existing.get("address", "").lower()
 
     @classmethod
-    async def create_index(cls) -> None:
+    async def create_index(cls) -> AsyncSearch:
         """
         Create RediSearch index for token search capabilities.
+
+        The index is probed or created once per process; later calls return it
+        without a round-trip until _drop_index drops it.
         """
         async with Cache.get_client() as redis_client:
             index = redis_client.ft(cls.index_name)
-
-            try:
-                await index.info()
+            if cls._index_ready:
                 return index
-            except Exception:
-                pass
 
-            # Create index with schema for searchable fields
-            schema = [
-                TextField("symbol_lower", weight=2.0),
-                TextField("name_lower", weight=1.5),
-                TextField("address_lower", weight=1.0),
-            ]
+            async with cls._index_lock:
+                if cls._index_ready:
+                    return index
 
-            definition = IndexDefinition(prefix=[f"{cls.key_prefix}:"])
-
-            return await index.create_index(fields=schema, definition=definition)
+                try:
+                    await index.info()
+                except Exception:
+                    # Create index with schema for searchable fields. The
+                    # suffix trie answers the *term* infix clause on names
+                    # without scanning the whole term dictionary.
+                    schema = [
+                        TextField("symbol_lower", weight=2.0),
+                        TextField("name_lower", weight=1.5, withsuffixtrie=True),
+                        TextField("address_lower", weight=1.0),
+                    ]
+
+                    definition = IndexDefinition(prefix=[f"{cls.key_prefix}:"])
+
+                    await index.create_index(fields=schema, definition=definition)
+
+                    for legacy_name in cls.legacy_index_names:
+                        try:
+                            await redis_client.ft(legacy_name).dropindex()
+                        except Exception:
+                            pass
+
+                cls._index_ready = True
+                return index
 
     @classmethod
     async def refresh(cls) -> None:
@@ -110,26 +247,47 @@ class TokenManager:
             cls._seed_native_tokens(registry)
 
             ingestion_sources = [
-                ("coingecko", cls.ingest_from_coingecko(registry)),
-                ("jupiter:lst", cls.ingest_from_jupiter("lst", registry)),
-                ("jupiter:verified", cls.ingest_from_jupiter("verified", registry)),
-                ("near_intents", cls.ingest_from_near_intents(registry)),
-                ("lifi", cls.ingest_from_lifi(registry)),
+                ("coingecko", cls.ingest_from_coingecko),
+                ("jupiter:lst", functools.partial(cls.ingest_from_jupiter, "lst")),
+                (
+                    "jupiter:verified",
+                    functools.partial(cls.ingest_from_jupiter, "verified"),
+                ),
+                ("near_intents", cls.ingest_from_near_intents),
+                ("lifi", cls.ingest_from_lifi),
             ]
 
-            for source_name, coro in ingestion_sources:
+            async def ingest(source_name, ingest_fn) -> TokenRegistry:
+                source_registry: TokenRegistry = {}
                 try:
-                    await coro
+                    await ingest_fn(source_registry)
                 except Exception:
                     logger.exception("Failed to ingest tokens from %s", source_name)
+                return source_registry
+
+            # Fetch all sources concurrently, each into its own registry, then
+            # merge them in source order so the result doesn't depend on which
+            # download finished first.
+            source_registries = await asyncio.gather(
+                *(ingest(name, fn) for name, fn in ingestion_sources)
+            )
+            for source_registry in source_registries:
+                for key, token_data in source_registry.items():
+                    cls._merge_into_registry(registry, key, token_data)
 
             # Write merged registry to pipeline
             for key, token_data in registry.items():
                 pipe.hset(key, mapping=token_data)
 
-            # Create index and execute atomically
+            # Rebuild the index and execute atomically. The index is dropped
+            # only now, after the downloads, so searches keep working while
+            # sources are fetched.
+            pipe.incr(cls.generation_key)
+            await cls._drop_index()
             await cls.create_index()
             await pipe.execute()
+            cls._token_cache.clear()
+            cls._generation_cache.clear()
 
             # Record the schema version the registry was written with.
             await redis_client.set(cls.schema_version_key, TOKEN_SCHEMA_VERSION)
@@ -189,11 +347,18 @@ class TokenManager:
                 cursor, keys = await redis_client.scan(
                     cursor, match=f"{cls.key_prefix}:*", count=1_000
                 )
-                for key in keys:
-                    pipe.delete(key)
+                # Queued on the refresh pipeline so old keys disappear atomically
+                # with the new writes. UNLINK frees memory off Redis' main thread,
+                # and one command per scan batch keeps the transaction small.
+                if keys:
+                    pipe.unlink(*keys)
                 if cursor == 0:
                     break
 
+    @classmethod
+    async def _drop_index(cls) -> None:
+        """Drop the search index, keeping its documents, if it exists."""
+        async with Cache.get_client() as redis_client:
             index = redis_client.ft(cls.index_name)
             try:
                 await index.info()
@@ -201,6 +366,7 @@ class TokenManager:
                 pass
             else:
                 await index.dropindex()
+            cls._index_ready = False
 
     @classmethod
     def _seed_native_tokens(cls, registry: TokenRegistry) -> None:
@@ -230,14 +396,21 @@ class TokenManager:
         async with create_http_client(timeout=10.0) as client:
             response = await client.get(url)
             response.raise_for_status()
-            json_data = response.json()
+
+        # The token list is several megabytes; decode it in a worker thread so
+        # the event loop keeps serving requests during a refresh.
+        json_data = await asyncio.to_thread(json.loads, response.content)
 
         for raw_chain_id, tokens in json_data.items():
-            for address, raw_token_info in tokens.items():
-                chain = cls._chain_lookup.get(raw_chain_id)
-                if not chain:
-                    continue
+            chain = cls._chain_lookup.get(raw_chain_id)
+            if not chain:
+                continue
 
+            # Invariant across the chain's tokens
+            key_prefix = cls._chain_key_prefix(chain.coin, chain.chain_id)
+            sources = json.dumps([TokenSource.COINGECKO])
+
+            for address, raw_token_info in tokens.items():
                 decimals = raw_token_info.get("decimals")
                 if decimals is None:
                     continue
@@ -272,11 +445,15 @@ class TokenManager:
                     ),
                 )
 
-                key = cls._build_key(chain.coin, chain.chain_id, address)
                 token_data = cls._prepare_token_data(token_info)
-                token_data["sources"] = json.dumps([TokenSource.COINGECKO])
+                key = key_prefix + token_data["address_lower"]
+                token_data["sources"] = sources
                 cls._merge_into_registry(registry, key, token_data)
 
+            # Building tokens is CPU-bound; yield between chains so a refresh
+            # doesn't hold the event loop for the whole list.
+            await asyncio.sleep(0)
+
     @classmethod
     async def ingest_from_jupiter(
         cls, tag: Literal["lst", "verified"], registry: TokenRegistry
@@ -285,11 +462,14 @@ class TokenManager:
         async with create_http_client(timeout=10.0) as client:
             response = await client.get(url)
             response.raise_for_status()
-            json_data = response.json()
+
+        json_data = await asyncio.to_thread(json.loads, response.content)
 
         source = (
             TokenSource.JUPITER_LST if tag == "lst" else TokenSource.JUPITER_VERIFIED
         )
+        key_prefix = cls._chain_key_prefix(Chain.SOLANA.coin, Chain.SOLANA.chain_id)
+        sources = json.dumps([source])
 
         for token in json_data:
             token_info = TokenInfo(
@@ -312,9 +492,9 @@ class TokenManager:
                 ),
             )
 
-            key = cls._build_key(Chain.SOLANA.coin, Chain.SOLANA.chain_id, token["id"])
             token_data = cls._prepare_token_data(token_info)
-            token_data["sources"] = json.dumps([source])
+            key = key_prefix + token_data["address_lower"]
+            token_data["sources"] = sources
             cls._merge_into_registry(registry, key, token_data)
 
     @classmethod
@@ -364,17 +544,42 @@ class TokenManager:
         key = cls._build_key(coin, chain_id, address)
 
         try:
+            generation = await cls._generation()
+            if (cached := cls._token_cache.get((generation, key))) is not None:
+                return cached
+
+            # Read the token together with the generation it belongs to, so a
+            # read racing a write is never cached under the newer generation.
             async with Cache.get_client() as redis_client:
-                token_data = await redis_client.hgetall(key)
+                pipe = redis_client.pipeline()
+                pipe.get(cls.generation_key)
+                pipe.hgetall(key)
+                generation, token_data = await pipe.execute()
 
             if not token_data:
                 return None
 
-            return cls._parse_token_from_redis_data(key, token_data)
+            token_info = cls._parse_token_from_redis_data(key, token_data)
+            cls._token_cache[(int(generation or 0), key)] = token_info
+            return token_info
         except Exception as e:
             logger.error("Error retrieving token: %s", e)
             return None
 
+    @classmethod
+    async def _generation(cls) -> int:
+        """Return this replica's recently read value of generation_key."""
+        if (generation := cls._generation_cache.get(cls.generation_key)) is None:
+            async with Cache.get_client() as redis_client:
+                generation = int(await redis_client.get(cls.generation_key) or 0)
+            cls._generation_cache[cls.generation_key] = generation
+        return generation
+
+    @staticmethod
+    def _decode_sources(raw: str) -> list[TokenSource]:
+        """Decode the stored JSON sources list into TokenSource members."""
+        return [TokenSource(source) for source in json.loads(raw)]
+
     @staticmethod
     def _coerce_token_type(raw: str | None) -> TokenType:
         """Map a missing or unrecognized stored token_type to UNKNOWN."""
@@ -386,34 +591,37 @@ class TokenManager:
             )
             return TokenType.UNKNOWN
 
+    @classmethod
+    def _chain_key_prefix(cls, coin: Coin, chain_id: str) -> str:
+        """Key prefix shared by every token of a chain, including the trailing ':'."""
+        return f"{cls.key_prefix}:{coin.value.lower()}:{chain_id.lower()}:"
+
     @classmethod
     def _build_key(cls, coin: Coin, chain_id: str, address: str | None = None) -> str:
-        return ":".join(
-            (
-                cls.key_prefix,
-                coin.value.lower(),
-                chain_id.lower(),
-                (address or "").lower(),
-            )
-        )
+        return cls._chain_key_prefix(coin, chain_id) + (address or "").lower()
 
     @staticmethod
     def _prepare_token_data(token_info: TokenInfo) -> dict[str, str]:
-        token_data = token_info.model_dump(mode="json")
-        token_data["name_lower"] = token_info.name.lower()
-        token_data["symbol_lower"] = token_info.symbol.lower()
-        token_data["address_lower"] = (token_info.address or "").lower()
-
-        # Store sources as JSON string
-        if "sources" in token_data and isinstance(token_data["sources"], list):
-            token_data["sources"] = json.dumps(token_data["sources"])
-
-        # Convert None values to empty strings for Redis compatibility
-        for key, value in token_data.items():
-            if value is None:
-                token_data[key] = ""
-
-        return token_data
+        # Read fields directly rather than through model_dump(): this runs for
+        # every token on refresh, and the hash layout is flat and fixed.
+        # None values become empty strings for Redis compatibility.
+        address = token_info.address or ""
+        return {
+            "coin": token_info.coin.value,
+            "chain_id": token_info.chain_id,
+            "address": address,
+            "name": token_info.name,
+            "symbol": token_info.symbol,
+            "decimals": token_info.decimals,
+            "logo": token_info.logo or "",
+            # Store sources as JSON string
+            "sources": json.dumps([source.value for source in token_info.sources]),
+            "token_type": token_info.token_type.value,
+            "near_intents_asset_id": token_info.near_intents_asset_id or "",
+            "name_lower": token_info.name.lower(),
+            "symbol_lower": token_info.symbol.lower(),
+            "address_lower": address.lower(),
+        }
 
     @classmethod
     def _parse_token_from_redis_data(
@@ -426,15 +634,17 @@ class TokenManager:
         # Read the address from token_data to preserve case sensitivity
         address = token_data.get("address")
 
-        return TokenInfo(
-            coin=Coin(coin_str.upper()),
+        # Records were validated when written, so skip re-validation; every field
+        # is converted to its declared type here instead.
+        return TokenInfo.model_construct(
+            coin=cls._coin_lookup[coin_str],
             chain_id=chain_id,
             address=address if address else None,
             name=token_data["name"],
             symbol=token_data["symbol"],
             decimals=int(token_data["decimals"]),
             logo=token_data.get("logo") or None,
-            sources=json.loads(token_data.get("sources", "[]")),
+            sources=cls._decode_sources(token_data.get("sources", "[]")),
             token_type=cls._coerce_token_type(token_data.get("token_type")),
             near_intents_asset_id=token_data.get("near_intents_asset_id") or None,
         )
@@ -446,7 +656,11 @@ class TokenManager:
 
         try:
             async with Cache.get_client() as redis_client:
-                await redis_client.hset(key, mapping=token_data)
+                pipe = redis_client.pipeline()
+                pipe.hset(key, mapping=token_data)
+                pipe.incr(cls.generation_key)
+                await pipe.execute()
+                cls._generation_cache.clear()
                 logger.info("Added/updated token at %s", key)
         except Exception as e:
             logger.error("Error adding token: %s", e)
@@ -457,18 +671,19 @@ class TokenManager:
     ) -> TokenSearchResponse:
         results = []
         for doc in result.docs:
-            # Parse the key to extract coin and chain_id
-            _, coin, chain_id, _ = doc.id.split(":")
+            # Parse the key to extract coin and chain_id. The split is bounded so
+            # the address tail is never broken up.
+            _, coin, chain_id, _ = doc.id.split(":", 3)
 
-            token_info = TokenInfo(
-                coin=Coin(coin.upper()),
+            token_info = TokenInfo.model_construct(
+                coin=cls._coin_lookup[coin],
                 chain_id=chain_id,
                 address=doc.address,
                 name=doc.name,
                 symbol=doc.symbol.upper(),
                 decimals=int(doc.decimals),
                 logo=doc.logo,
-                sources=json.loads(doc.sources),
+                sources=cls._decode_sources(doc.sources),
                 token_type=cls._coerce_token_type(getattr(doc, "token_type", None)),
                 near_intents_asset_id=doc.near_intents_asset_id or None,
             )
@@ -490,9 +705,7 @@ class TokenManager:
         async with Cache.get_client() as redis_client:
             # Create the key pattern to match all tokens for this coin
             if chain_id:
-                key_pattern = (
-                    f"{cls.key_prefix}:{coin.value.lower()}:{chain_id.lower()}:*"
-                )
+                key_pattern = f"{cls._chain_key_prefix(coin, chain_id)}*"
             else:
                 key_pattern = f"{cls.key_prefix}:{coin.value.lower()}:*"
 
@@ -536,58 +749,40 @@ class TokenManager:
 
     @classmethod
     async def search(cls, query: str, offset: int, limit: int) -> TokenSearchResponse:
-        query_lower = query.strip().lower()
-        index = await cls.create_index()
-
-        # Build comprehensive DIALECT 2 compliant search query with multiple matching strategies
-        search_query = ""
-        fuzz = "%" * 2
-
-        # Unified search logic for both single and multi-word queries
-        terms = query_lower.split()
-        search_parts = []
-
-        # Define search fields for different matching strategies
-        fuzzy_prefix_fields = ["name_lower"]
-
-        # 1. Exact symbol matches (highest priority - weight 5.0)
-        if len(terms) == 1:
-            exact_terms = [f"{term}" for term in terms]
-            symbol_exact = f"@symbol_lower:({' '.join(exact_terms)})"
-            search_parts.append(f"({symbol_exact}) => {{ $weight: 5.0; }}")
-
-        # 2. Exact address matches (highest priority - weight 5.0)
-        if len(terms) == 1:
-            exact_terms = [f"{term}" for term in terms]
-            address_exact = f"@address_lower:({' '.join(exact_terms)})"
-            search_parts.append(f"({address_exact}) => {{ $weight: 5.0; }}")
-
-        # 3. Exact name matches (high priority - weight 2.0)
-        if len(terms) >= 1:
-            exact_terms = [f"{term}" for term in terms]
-            name_exact = f"@name_lower:({' '.join(exact_terms)})"
-            search_parts.append(f"({name_exact}) => {{ $weight: 2.0; }}")
-
-        # 4. Prefix/infix matches for name field (lower priority - weight 1.0)
-        if len(terms) >= 1:
-            prefix_terms = [f"*{term}*" for term in terms]
-            for field in fuzzy_prefix_fields:
-                prefix_query = f"@{field}:({' '.join(prefix_terms)})"
-                search_parts.append(f"({prefix_query}) => {{ $weight: 1.0; }}")
-
-        # 5. Fuzzy matches for name field (lowest priority - weight 0.5)
-        if len(terms) >= 1:
-            fuzzy_terms = [f"{fuzz}{term}{fuzz}" for term in terms]
-            for field in fuzzy_prefix_fields:
-                fuzzy_query = f"@{field}:({' '.join(fuzzy_terms)})"
-                search_parts.append(f"({fuzzy_query}) => {{ $weight: 0.5; }}")
-
-        search_query = " | ".join(search_parts)
-
-        if not search_query:
-            search_query = "*"
-
-        q = Query(search_query).dialect(2).paging(offset, limit)
-        result = await index.search(q)
-
-        return cls._as_response(result, query, offset, limit)
+        # Keyed on this replica's view of the generation, like get(). A search
+        # racing a write caches its response under the old generation, which
+        # later searches no longer read.
+        generation = await cls._generation()
+        cache_key = f"{cls.search_cache_prefix}:{generation}:{offset}:{limit}:{query}"
+
+        async with Cache.get_client() as redis_client:
+            if cached := await redis_client.get(cache_key):
+                return TokenSearchResponse.model_validate_json(cached)
+
+            query_lower = query.strip().lower()
+            index = await cls.create_index()
+
+            search_query = _build_search_query(query_lower)
+
+            q = (
+                Query(search_query)
+                .dialect(2)
+                .paging(offset, limit)
+                .return_fields(*cls._search_return_fields)
+            )
+            try:
+                result = await index.search(q)
+            except ResponseError as e:
+                if not _is_unknown_index_error(e):
+                    raise
+                # Another replica dropped the index (during a refresh) after this
+                # one marked it ready; recreate it and retry once.
+                cls._index_ready = False
+                index = await cls.create_index()
+                result = await index.search(q)
+
+            response = cls._as_response(result, query, offset, limit)
+            await redis_client.set(
+                cache_key, response.model_dump_json(), ex=cls.search_cache_ttl
+            )
+            return response
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from dataclasses import dataclass
@@ -7,6 +8,7 @@ import fakeredis
 import httpx
 import pytest
 import respx
+from redis.exceptions import ResponseError
 
 from app.api.common.models import Chain, Coin, TokenInfo, TokenSource, TokenType
 from app.api.tokens.contants import SPL_TOKEN_2022_PROGRAM_ID, SPL_TOKEN_PROGRAM_ID
@@ -46,6 +48,18 @@ class MockPipeline:
         self.commands.append(("hset", key, mapping))
         return self
 
+    def unlink(self, *keys):
+        self.commands.append(("unlink", *keys))
+        return self
+
+    def get(self, key):
+        self.commands.append(("get", key))
+        return self
+
+    def incr(self, key):
+        self.commands.append(("incr", key))
+        return self
+
     async def execute(self):
         results = []
         for command in self.commands:
@@ -56,6 +70,12 @@ class MockPipeline:
                 # Actually store the data in the mock Redis client
                 await self.redis_client.hset(command[1], mapping=command[2])
                 results.append(None)
+            elif command[0] == "unlink":
+                results.append(await self.redis_client.unlink(*command[1:]))
+            elif command[0] == "get":
+                results.append(await self.redis_client.get(command[1]))
+            elif command[0] == "incr":
+                results.append(await self.redis_client.incr(command[1]))
         return results
 
 
@@ -75,6 +95,8 @@ class MockSearchDoc:
 @pytest.fixture
 def cache():
     redis_client = AsyncFakeRedis(server=fakeredis.FakeServer())
+    TokenManager._token_cache.clear()
+    TokenManager._generation_cache.clear()
 
     with patch("app.api.tokens.manager.Cache") as mock_cache:
         mock_cache.get_client.return_value.__aenter__.return_value = redis_client
@@ -118,6 +140,117 @@ async def test_add_and_get_token(cache, sample_token_info):
     assert result.sources == [TokenSource.COINGECKO]
 
 
+def test_prepare_token_data_covers_all_fields(sample_token_info):
+    """The hand-built hash must stay in sync with TokenInfo's fields."""
+    token_data = TokenManager._prepare_token_data(sample_token_info)
+
+    expected = sample_token_info.model_dump(mode="json")
+    expected["sources"] = json.dumps(expected["sources"])
+    expected = {k: "" if v is None else v for k, v in expected.items()}
+    expected["name_lower"] = "test token"
+    expected["symbol_lower"] = "test"
+    expected["address_lower"] = "0x1234567890123456789012345678901234567890"
+    assert token_data == expected
+
+
+@pytest.mark.asyncio
+async def test_get_returns_typed_fields(cache, sample_token_info):
+    """Tokens read back without validation still carry enum-typed fields."""
+    await TokenManager.add(sample_token_info)
+
+    result = await TokenManager.get(
+        sample_token_info.coin, sample_token_info.chain_id, sample_token_info.address
+    )
+
+    assert result == sample_token_info
+    assert all(isinstance(source, TokenSource) for source in result.sources)
+    assert isinstance(result.token_type, TokenType)
+
+
+@pytest.mark.asyncio
+async def test_get_serves_repeat_reads_from_memory(cache, sample_token_info):
+    redis_client = cache.get_client.return_value.__aenter__.return_value
+    await TokenManager.add(sample_token_info)
+    lookup = (
+        sample_token_info.coin,
+        sample_token_info.chain_id,
+        sample_token_info.address,
+    )
+
+    first = await TokenManager.get(*lookup)
+    with patch.object(redis_client, "hgetall") as mock_hgetall:
+        second = await TokenManager.get(*lookup)
+
+    assert second is first
+    mock_hgetall.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_add_invalidates_cached_token(cache, sample_token_info):
+    await TokenManager.add(sample_token_info)
+    lookup = (
+        sample_token_info.coin,
+        sample_token_info.chain_id,
+        sample_token_info.address,
+    )
+    await TokenManager.get(*lookup)
+
+    await TokenManager.add(sample_token_info.model_copy(update={"name": "Renamed"}))
+
+    result = await TokenManager.get(*lookup)
+    assert result.name == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_get_picks_up_writes_from_other_replicas(cache, sample_token_info):
+    redis_client = cache.get_client.return_value.__aenter__.return_value
+    await TokenManager.add(sample_token_info)
+    lookup = (
+        sample_token_info.coin,
+        sample_token_info.chain_id,
+        sample_token_info.address,
+    )
+    await TokenManager.get(*lookup)
+
+    # Another replica renames the token, and this replica's view of the
+    # generation expires
+    key = TokenManager._build_key(*lookup)
+    await redis_client.hset(key, "name", "Renamed")
+    await redis_client.incr(TokenManager.generation_key)
+    TokenManager._generation_cache.clear()
+
+    result = await TokenManager.get(*lookup)
+    assert result.name == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_get_racing_a_write_is_not_reused(cache, sample_token_info):
+    redis_client = cache.get_client.return_value.__aenter__.return_value
+    await TokenManager.add(sample_token_info)
+    lookup = (
+        sample_token_info.coin,
+        sample_token_info.chain_id,
+        sample_token_info.address,
+    )
+    key = TokenManager._build_key(*lookup)
+    execute = MockPipeline.execute
+
+    async def execute_then_write(pipe):
+        results = await execute(pipe)
+        # A write lands after this read and before it is cached
+        await redis_client.hset(key, "name", "Renamed")
+        await redis_client.incr(TokenManager.generation_key)
+        TokenManager._generation_cache.clear()
+        return results
+
+    with patch.object(MockPipeline, "execute", execute_then_write):
+        stale = await TokenManager.get(*lookup)
+
+    result = await TokenManager.get(*lookup)
+    assert stale.name == "Test Token"
+    assert result.name == "Renamed"
+
+
 @pytest.mark.asyncio
 async def test_get_token_not_found(cache):
     # Try to get a non-existent token
@@ -293,6 +426,174 @@ async def test_search_no_results(cache):
         assert result.total == 0
 
 
+@pytest.mark.asyncio
+async def test_search_reuses_recent_results(cache, sample_token_info):
+    redis_client = cache.get_client.return_value.__aenter__.return_value
+    mock_index = AsyncMock()
+    mock_index.search = AsyncMock(return_value=MockSearchResult(docs=[], total=0))
+
+    with patch.object(TokenManager, "create_index", return_value=mock_index):
+        first = await TokenManager.search("usdc", 0, 10)
+        # A hit costs a single round-trip
+        with patch.object(redis_client, "get", wraps=redis_client.get) as mock_get:
+            second = await TokenManager.search("usdc", 0, 10)
+        mock_get.assert_called_once()
+        await TokenManager.search("usdc", 10, 10)
+
+        # Writes invalidate cached searches
+        await TokenManager.add(sample_token_info)
+        await TokenManager.search("usdc", 0, 10)
+
+        # Including writes made by another replica, once this replica's view
+        # of the generation expires
+        await redis_client.incr(TokenManager.generation_key)
+        TokenManager._generation_cache.clear()
+        await TokenManager.search("usdc", 0, 10)
+
+    assert second == first
+    assert mock_index.search.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_search_racing_a_write_is_not_reused(cache):
+    redis_client = cache.get_client.return_value.__aenter__.return_value
+
+    async def search_during_write(query):
+        # A write lands while the search is running
+        await redis_client.incr(TokenManager.generation_key)
+        TokenManager._generation_cache.clear()
+        return MockSearchResult(docs=[], total=0)
+
+    mock_index = AsyncMock()
+    mock_index.search = AsyncMock(side_effect=search_during_write)
+
+    with patch.object(TokenManager, "create_index", return_value=mock_index):
+        await TokenManager.search("usdc", 0, 10)
+        await TokenManager.search("usdc", 0, 10)
+
+    assert mock_index.search.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_create_index_probes_redis_once(cache, monkeypatch):
+    redis_client = cache.get_client.return_value.__aenter__.return_value
+    mock_index = AsyncMock()
+    mock_index.info.side_effect = Exception("Unknown index name")
+    monkeypatch.setattr(redis_client, "ft", Mock(return_value=mock_index))
+    monkeypatch.setattr(TokenManager, "_index_ready", False)
+
+    assert await TokenManager.create_index() is mock_index
+    assert await TokenManager.create_index() is mock_index
+
+    mock_index.info.assert_awaited_once()
+    mock_index.create_index.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_index_uses_suffix_trie_and_drops_legacy_index(cache, monkeypatch):
+    redis_client = cache.get_client.return_value.__aenter__.return_value
+    mock_index = AsyncMock()
+    mock_index.info.side_effect = Exception("Unknown index name")
+    legacy_index = AsyncMock()
+    indexes = {TokenManager.index_name: mock_index, "token_idx": legacy_index}
+    monkeypatch.setattr(redis_client, "ft", Mock(side_effect=indexes.__getitem__))
+    monkeypatch.setattr(TokenManager, "_index_ready", False)
+
+    await TokenManager.create_index()
+
+    fields = {
+        field.name: field
+        for field in mock_index.create_index.call_args.kwargs["fields"]
+    }
+    assert "WITHSUFFIXTRIE" in fields["name_lower"].args
+    legacy_index.dropindex.assert_awaited_once_with()
+
+
+@pytest.mark.asyncio
+async def test_drop_index_resets_index_ready(cache, monkeypatch):
+    monkeypatch.setattr(TokenManager, "_index_ready", True)
+
+    await TokenManager._drop_index()
+
+    assert TokenManager._index_ready is False
+
+
+class FakeSearchIndex:
+    """A RediSearch index shared by every "replica" in a test."""
+
+    def __init__(self):
+        self.exists = True
+        self.search_count = 0
+
+    async def info(self):
+        if not self.exists:
+            raise ResponseError("Unknown index name")
+        return {}
+
+    async def create_index(self, fields, definition):
+        self.exists = True
+
+    async def dropindex(self):
+        if not self.exists:
+            raise ResponseError("Unknown index name")
+        self.exists = False
+
+    async def search(self, query):
+        self.search_count += 1
+        if not self.exists:
+            raise ResponseError("token_idx_v2: no such index")
+        return MockSearchResult(docs=[], total=0)
+
+
+@pytest.fixture
+def shared_index(cache, monkeypatch):
+    redis_client = cache.get_client.return_value.__aenter__.return_value
+    index = FakeSearchIndex()
+    other_indexes = {}
+
+    def ft(index_name):
+        if index_name == TokenManager.index_name:
+            return index
+        return other_indexes.setdefault(index_name, FakeSearchIndex())
+
+    monkeypatch.setattr(redis_client, "ft", Mock(side_effect=ft))
+    return index
+
+
+@pytest.mark.asyncio
+async def test_clear_tokens_keeps_index_for_other_replicas(
+    cache, shared_index, monkeypatch
+):
+    redis_client = cache.get_client.return_value.__aenter__.return_value
+    index = shared_index
+    # This replica already saw the index and won't probe it again
+    monkeypatch.setattr(TokenManager, "_index_ready", True)
+
+    # Another replica starts a refresh
+    await TokenManager._clear_tokens(MockPipeline(redis_client))
+
+    result = await TokenManager.search("usdc", 0, 10)
+    assert result.total == 0
+    assert index.exists
+    assert index.search_count == 1
+
+
+@pytest.mark.asyncio
+async def test_search_recreates_index_dropped_by_another_replica(
+    cache, shared_index, monkeypatch
+):
+    index = shared_index
+    monkeypatch.setattr(TokenManager, "_index_ready", True)
+
+    # Another replica's refresh dropped the index and died before recreating it
+    await index.dropindex()
+
+    result = await TokenManager.search("usdc", 0, 10)
+    assert result.total == 0
+    assert index.exists
+    assert index.search_count == 2
+
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_refresh_with_coingecko_data(cache):
@@ -485,6 +786,19 @@ QUERIES = [
         "(@name_lower:(*basic* *attention* *token* *portal*)) => { $weight: 1.0; } | "
         "(@name_lower:(%%basic%% %%attention%% %%token%% %%portal%%)) => { $weight: 0.5; }",
     ),
+    # Short terms skip the fuzzy clause
+    (
+        "eth",
+        "(@symbol_lower:(eth)) => { $weight: 5.0; } | "
+        "(@address_lower:(eth)) => { $weight: 5.0; } | "
+        "(@name_lower:(eth)) => { $weight: 2.0; } | "
+        "(@name_lower:(*eth*)) => { $weight: 1.0; }",
+    ),
+    (
+        "usd coin",
+        "(@name_lower:(usd coin)) => { $weight: 2.0; } | "
+        "(@name_lower:(*usd* *coin*)) => { $weight: 1.0; }",
+    ),
     # Case insensitive test
     (
         "BiTcOiN",
@@ -522,6 +836,7 @@ async def test_search_query_construction(cache, query, expected_query):
         mock_query_class.return_value = mock_query_instance
         mock_query_instance.dialect.return_value = mock_query_instance
         mock_query_instance.paging.return_value = mock_query_instance
+        mock_query_instance.return_fields.return_value = mock_query_instance
 
         # Test the query
         await TokenManager.search(query, offset, limit)
@@ -531,9 +846,12 @@ async def test_search_query_construction(cache, query, expected_query):
         actual_query = mock_query_class.call_args[0][0]
         assert actual_query == expected_query
 
-        # Verify dialect and paging were called
+        # Verify dialect, paging and returned fields were set
         mock_query_instance.dialect.assert_called_once_with(2)
         mock_query_instance.paging.assert_called_once_with(offset, limit)
+        mock_query_instance.return_fields.assert_called_once_with(
+            *TokenManager._search_return_fields
+        )
 
 
 @pytest.mark.asyncio
@@ -689,6 +1007,27 @@ async def test_refresh_logs_error_on_source_failure(cache, caplog):
     assert "Failed to ingest tokens from coingecko" in caplog.text
 
 
+@pytest.mark.asyncio
+async def test_refresh_fetches_sources_concurrently(cache):
+    """CoinGecko can only finish once LiFi has started, so they must overlap."""
+    lifi_started = asyncio.Event()
+
+    async def ingest_coingecko(registry):
+        await lifi_started.wait()
+
+    async def ingest_lifi(registry):
+        lifi_started.set()
+
+    with (
+        patch.object(TokenManager, "create_index"),
+        patch.object(TokenManager, "ingest_from_coingecko", ingest_coingecko),
+        patch.object(TokenManager, "ingest_from_jupiter"),
+        patch.object(TokenManager, "ingest_from_near_intents"),
+        patch.object(TokenManager, "ingest_from_lifi", ingest_lifi),
+    ):
+        await asyncio.wait_for(TokenManager.refresh(), timeout=1)
+
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_refresh_prefers_png_logo_over_svg(cache):
@@ -924,6 +1263,21 @@ async def test_refresh_writes_schema_version(cache):
     assert stored == TOKEN_SCHEMA_VERSION
 
 
+@pytest.mark.asyncio
+async def test_refresh_removes_stale_tokens(cache):
+    redis_client = cache.get_client.return_value.__aenter__.return_value
+    stale_key = f"{TokenManager.key_prefix}:stale"
+    await redis_client.hset(stale_key, mapping={"symbol": "OLD"})
+
+    create_index, coingecko, jupiter, near_intents, lifi = _ingestion_patches()
+    with create_index, coingecko, jupiter, near_intents, lifi:
+        await TokenManager.refresh()
+
+    assert not await redis_client.exists(stale_key)
+    assert await TokenManager.get(Chain.SOLANA.coin, Chain.SOLANA.chain_id, None)
+    assert int(await redis_client.get(TokenManager.generation_key)) == 1
+
+
 @pytest.mark.asyncio
 async def test_refresh_if_stale_reseeds_when_empty(cache):
     create_index, coingecko, jupiter, near_intents, lifi = _ingestion_patches()
@@ -30,6 +30,12 @@ class Settings(BaseSettings):
 
     # Swap providers
     NEAR_INTENTS_BASE_URL: str = "https://1click.chaindefuser.com"
+    # Maximum concurrent provider route fetches per AUTO quote request
+    PROVIDER_FANOUT_LIMIT: int = 8
+
+    # Shared HTTP connection pool used by all swap provider clients
+    HTTP_POOL_MAX_CONNECTIONS: int = 400
+    HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS: int = 200
 
     # Monitoring
     SENTRY_DSN: str | None = None
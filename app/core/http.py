@@ -5,6 +5,8 @@ import time
 
 import httpx
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
@@ -44,6 +46,9 @@ class RetryTransport(httpx.AsyncBaseTransport):
         for attempt in range(self._max_retries + 1):
             try:
                 response = await self._wrapped.handle_async_request(request)
+            except httpx.PoolTimeout:
+                # Our own pool is exhausted; retrying would only add more waiters
+                raise
             except RETRYABLE_EXCEPTIONS as exc:
                 elapsed = time.monotonic() - start
                 if attempt == self._max_retries or elapsed >= self._max_total_time:
@@ -111,12 +116,63 @@ class RetryTransport(httpx.AsyncBaseTransport):
         await self._wrapped.aclose()
 
 
+class _SharedPoolTransport(httpx.AsyncBaseTransport):
+    """Forwards to the shared connection pool without closing it.
+
+    Clients are still opened per call with ``async with``; closing one must not
+    tear down pooled connections that other clients are using.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+_shared_transport: httpx.AsyncHTTPTransport | None = None
+
+
+def _get_shared_transport() -> httpx.AsyncBaseTransport:
+    global _shared_transport
+    if _shared_transport is None:
+        # Sized for every provider's AUTO fan-out and support probes at once,
+        # rather than httpx's per-client defaults
+        _shared_transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS,
+            )
+        )
+    return _SharedPoolTransport(_shared_transport)
+
+
+async def close_shared_transport() -> None:
+    """Close the shared connection pool. Called on application shutdown."""
+    global _shared_transport
+    if _shared_transport is not None:
+        await _shared_transport.aclose()
+        _shared_transport = None
+
+
 def create_http_client(
     *,
     headers: httpx.Headers | dict[str, str] | None = None,
+    shared_pool: bool = False,
     **kwargs,
 ) -> httpx.AsyncClient:
-    transport = RetryTransport()
+    """Create an AsyncClient that retries transient failures.
+
+    With shared_pool=True, the client sends requests through a process-wide
+    connection pool, so TCP/TLS connections are reused across short-lived
+    clients instead of being re-established on every call.
+    """
+    transport = RetryTransport(
+        transport=_get_shared_transport() if shared_pool else None
+    )
 
     if "transport" in kwargs:
         logger.warning(
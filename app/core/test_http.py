@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, patch
 import httpx
 import pytest
 
+from app.core import http
 from app.core.http import RetryTransport, create_http_client
 
 
@@ -213,6 +214,18 @@ async def test_mixed_exception_and_status_code_retries():
     assert mock.attempt == 3
 
 
+@pytest.mark.asyncio
+async def test_pool_timeout_is_not_retried():
+    mock = MockTransport([httpx.PoolTimeout("pool exhausted"), _make_response(200)])
+    transport = _make_retry_transport(mock, initial_delay=0.0, jitter_factor=0.0)
+
+    request = httpx.Request("GET", "https://example.com")
+    with pytest.raises(httpx.PoolTimeout):
+        await transport.handle_async_request(request)
+
+    assert mock.attempt == 1
+
+
 @pytest.mark.asyncio
 async def test_non_retryable_exception_propagates_immediately():
     mock = MockTransport([RuntimeError("unexpected")])
@@ -232,3 +245,45 @@ async def test_create_http_client_returns_async_client():
         assert isinstance(client, httpx.AsyncClient)
     finally:
         await client.aclose()
+
+
+class ClosableMockTransport(MockTransport):
+    def __init__(self, responses: list[httpx.Response | Exception]):
+        super().__init__(responses)
+        self.closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_shared_pool_survives_client_close(monkeypatch):
+    pool = ClosableMockTransport([_make_response(200)])
+    monkeypatch.setattr(http, "_shared_transport", pool)
+
+    async with create_http_client(shared_pool=True) as client:
+        response = await client.get("https://example.com")
+    async with create_http_client(shared_pool=True) as client:
+        await client.get("https://example.com")
+
+    assert response.status_code == 200
+    assert pool.attempt == 2
+    assert not pool.closed
+
+    await http.close_shared_transport()
+
+    assert pool.closed
+    assert http._shared_transport is None
+
+
+def test_shared_pool_limits_come_from_settings(monkeypatch):
+    monkeypatch.setattr(http, "_shared_transport", None)
+    monkeypatch.setattr(http.settings, "HTTP_POOL_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(http.settings, "HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS", 3)
+
+    with patch("app.core.http.httpx.AsyncHTTPTransport") as transport_cls:
+        http._get_shared_transport()
+
+    transport_cls.assert_called_once_with(
+        limits=httpx.Limits(max_connections=7, max_keepalive_connections=3)
+    )
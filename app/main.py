@@ -23,6 +23,7 @@ from app.api.tokens.manager import TokenManager
 from app.api.tokens.routes import router as tokens_router
 from app.config import settings
 from app.core.cache import Cache
+from app.core.http import close_shared_transport
 from app.core.logging import install_access_log_sanitizer
 
 logger = logging.getLogger(__name__)
@@ -72,9 +73,20 @@ async def lifespan_tokens(app: FastAPI):
     yield
 
 
+@asynccontextmanager
+async def lifespan_http(app: FastAPI):
+    yield
+    await close_shared_transport()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with lifespan_cache(app), lifespan_tokens(app), lifespan_metrics(app):
+    async with (
+        lifespan_cache(app),
+        lifespan_tokens(app),
+        lifespan_metrics(app),
+        lifespan_http(app),
+    ):
         yield
 
 